@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 import json
 from dotenv import load_dotenv
 from datetime import datetime
+from contextlib import contextmanager
 
 import os
 import sys
@@ -9,13 +10,18 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from main.markets.market import get_share_price
-from main.utils.database import write_account, read_account, write_log
+from main.markets.market import get_share_price, get_share_prices
+from main.utils.database import (
+    write_account, read_account, read_account_transactions, update_account, write_log, PORTFOLIO_RECENT_POINTS
+)
+from main.utils.metrics import registry
 
 load_dotenv(override=True)
 
 INITIAL_BALANCE = 10_000.0
 SPREAD = 0.002
+# Newest transactions included in report(); the full history is list_transactions()
+REPORT_TRANSACTIONS = 10
 
 
 class Transaction(BaseModel):
@@ -37,27 +43,155 @@ class Account(BaseModel):
     balance: float
     strategy: str
     holdings: dict[str, int]
+    # Loaded lazily: a stored account starts with only the transactions made since it was
+    # loaded; list_transactions() (or _load_transactions()) pulls in the rest
     transactions: list[Transaction]
     portfolio_value_time_series: list[tuple[str, float]]
 
+    # What the database already holds, so save() only writes the rows that changed
+    _saved_holdings: dict[str, int] = PrivateAttr(default_factory=dict)
+    _saved_transactions: int = PrivateAttr(default=0)
+    _saved_points: int = PrivateAttr(default=0)
+    # Stored transactions not loaded into self.transactions, and their sum of quantity * price
+    _unloaded_transactions: int = PrivateAttr(default=0)
+    _unloaded_spent: float = PrivateAttr(default=0.0)
+    # Set by reset(): the next save replaces everything stored instead of appending
+    _rewrite: bool = PrivateAttr(default=False)
+    # Fields changed since the last save, and how deep we are in nested unit_of_work blocks
+    _dirty: set[str] = PrivateAttr(default_factory=set)
+    _unit_depth: int = PrivateAttr(default=0)
+
     @classmethod
     def get(cls, name: str):
+        """ Load an account; a missing one starts from defaults and is only written on its first save. """
         fields = read_account(name.lower())
         if not fields:
-            fields = {
-                "name": name.lower(),
-                "balance": INITIAL_BALANCE,
-                "strategy": "",
-                "holdings": {},
-                "transactions": [],
-                "portfolio_value_time_series": []
-            }
-            write_account(name, fields)
-        return cls(**fields)
-    
+            account = cls(
+                name=name.lower(),
+                balance=INITIAL_BALANCE,
+                strategy="",
+                holdings={},
+                transactions=[],
+                portfolio_value_time_series=[],
+            )
+            account._dirty = set(cls.model_fields)
+            return account
+        spent = fields.pop("spent")
+        transaction_count = fields.pop("transaction_count")
+        account = cls(transactions=[], **fields)
+        account._unloaded_transactions = transaction_count
+        account._unloaded_spent = spent
+        account._mark_saved()
+        return account
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            self._dirty.add(name)
+
+    def _mark_saved(self):
+        # Older points live in the tiered history (read_portfolio_series); keep memory bounded
+        excess = len(self.portfolio_value_time_series) - PORTFOLIO_RECENT_POINTS
+        if excess > 0:
+            del self.portfolio_value_time_series[:excess]
+        self._saved_holdings = dict(self.holdings)
+        self._saved_transactions = len(self.transactions)
+        self._saved_points = len(self.portfolio_value_time_series)
+        self._rewrite = False
+        self._dirty = set()
+
+    def _load_transactions(self):
+        """ Put the stored transactions not loaded yet in front of the ones made since loading. """
+        if not self._unloaded_transactions:
+            return
+        # The stored rows include any saved since loading; keep only the unsaved ones from memory
+        stored = [Transaction(**t) for t in read_account_transactions(self.name)]
+        self.transactions[:] = stored + self.transactions[self._saved_transactions:]
+        self._saved_transactions = len(stored)
+        self._unloaded_transactions = 0
+        self._unloaded_spent = 0.0
+
+    def _recent_transactions(self, n: int) -> list[Transaction]:
+        if len(self.transactions) >= n or not self._unloaded_transactions:
+            return self.transactions[-n:]
+        stored = [Transaction(**t) for t in read_account_transactions(self.name, last_n=n)]
+        return (stored + self.transactions[self._saved_transactions:])[-n:]
+
+    def transaction_count(self) -> int:
+        """ How many transactions the account has made, without loading them. """
+        return self._unloaded_transactions + len(self.transactions)
+
+    def _now(self) -> str:
+        """ Timestamp for new transactions and portfolio points; replays substitute their own clock. """
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    def _log(self, message: str):
+        write_log(self.name, "account", message)
+
+    def _count_trade(self, symbol: str, side: str):
+        registry.counter("trades_total", "Executed trades by symbol and side", symbol=symbol, side=side).inc()
+
+    @contextmanager
+    def unit_of_work(self):
+        """ Batch every mutation made inside the block into a single save and commit. """
+        # If the block or its save fails, the account goes back to how the outermost block
+        # found it, so neither the database nor a later save() sees a half-applied operation
+        checkpoint = None if self._unit_depth else self._checkpoint()
+        self._unit_depth += 1
+        try:
+            try:
+                yield self
+            finally:
+                self._unit_depth -= 1
+            if checkpoint is not None:
+                self.save()
+        except BaseException:
+            if checkpoint is not None:
+                self._restore(checkpoint)
+            raise
+
+    def _checkpoint(self) -> tuple:
+        return (
+            self.balance,
+            self.strategy,
+            dict(self.holdings),
+            len(self.transactions),
+            len(self.portfolio_value_time_series),
+            set(self._dirty),
+        )
+
+    def _restore(self, checkpoint: tuple):
+        self.balance, self.strategy, self.holdings, transactions, points, dirty = checkpoint
+        del self.transactions[transactions:]
+        del self.portfolio_value_time_series[points:]
+        self._dirty = dirty
     
     def save(self):
-        write_account(self.name.lower(), self.model_dump())
+        """ Persist only what changed since the account was loaded or last saved. """
+        if self._unit_depth or not self._dirty:
+            return
+        if self._rewrite:
+            # History was cleared, so rewrite the account from scratch
+            write_account(self.name.lower(), self.model_dump())
+        else:
+            changed_holdings = {}
+            if "holdings" in self._dirty:
+                changed_holdings = {
+                    symbol: quantity
+                    for symbol, quantity in self.holdings.items()
+                    if self._saved_holdings.get(symbol) != quantity
+                }
+                for symbol in self._saved_holdings.keys() - self.holdings.keys():
+                    changed_holdings[symbol] = 0
+            update_account(
+                self.name,
+                self.balance,
+                self.strategy,
+                holdings=changed_holdings,
+                transactions=[t.model_dump() for t in self.transactions[self._saved_transactions:]],
+                portfolio_points=self.portfolio_value_time_series[self._saved_points:],
+            )
+        self._mark_saved()
 
     def reset(self, strategy: str):
         self.balance = INITIAL_BALANCE
@@ -65,6 +199,9 @@ class Account(BaseModel):
         self.holdings = {}
         self.transactions = []
         self.portfolio_value_time_series = []
+        self._unloaded_transactions = 0
+        self._unloaded_spent = 0.0
+        self._rewrite = True
         self.save()
 
     def deposit(self, amount: float):
@@ -94,18 +231,21 @@ class Account(BaseModel):
         elif price==0:
             raise ValueError(f"Unrecognized symbol {symbol}")
         
-        # Update holdings
-        self.holdings[symbol] = self.holdings.get(symbol, 0) + quantity
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Record transaction
-        transaction = Transaction(symbol=symbol, quantity=quantity, price=buy_price, timestamp=timestamp, rationale=rationale)
-        self.transactions.append(transaction)
-        
-        # Update balance
-        self.balance -= total_cost
-        self.save()
-        write_log(self.name, "account", f"Bought {quantity} of {symbol}")
-        return "Completed. Latest details:\n" + self.report()
+        with self.unit_of_work():
+            # Update holdings
+            self.holdings[symbol] = self.holdings.get(symbol, 0) + quantity
+            timestamp = self._now()
+            # Record transaction
+            transaction = Transaction(symbol=symbol, quantity=quantity, price=buy_price, timestamp=timestamp, rationale=rationale)
+            self.transactions.append(transaction)
+            self._dirty.update(("holdings", "transactions"))
+            
+            # Update balance
+            self.balance -= total_cost
+            details = self._report()
+        self._count_trade(symbol, "buy")
+        self._log(f"Bought {quantity} of {symbol}")
+        return "Completed. Latest details:\n" + details
 
     def sell_shares(self, symbol: str, quantity: int, rationale: str) -> str:
         """ Sell shares of a stock if the user has enough shares. """
@@ -116,33 +256,37 @@ class Account(BaseModel):
         sell_price = price * (1 - SPREAD)
         total_proceeds = sell_price * quantity
         
-        # Update holdings
-        self.holdings[symbol] -= quantity
-        
-        # If shares are completely sold, remove from holdings
-        if self.holdings[symbol] == 0:
-            del self.holdings[symbol]
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        # Record transaction
-        transaction = Transaction(symbol=symbol, quantity=-quantity, price=sell_price, timestamp=timestamp, rationale=rationale)  # negative quantity for sell
-        self.transactions.append(transaction)
-
-        # Update balance
-        self.balance += total_proceeds
-        self.save()
-        write_log(self.name, "account", f"Sold {quantity} of {symbol}")
-        return "Completed. Latest details:\n" + self.report()
+        with self.unit_of_work():
+            # Update holdings
+            self.holdings[symbol] -= quantity
+            
+            # If shares are completely sold, remove from holdings
+            if self.holdings[symbol] == 0:
+                del self.holdings[symbol]
+            timestamp = self._now()
+            # Record transaction
+            transaction = Transaction(symbol=symbol, quantity=-quantity, price=sell_price, timestamp=timestamp, rationale=rationale)  # negative quantity for sell
+            self.transactions.append(transaction)
+            self._dirty.update(("holdings", "transactions"))
+
+            # Update balance
+            self.balance += total_proceeds
+            details = self._report()
+        self._count_trade(symbol, "sell")
+        self._log(f"Sold {quantity} of {symbol}")
+        return "Completed. Latest details:\n" + details
 
     def calculate_portfolio_value(self):
         """ Calculate the total value of the user's portfolio. """
         total_value = self.balance
+        prices = get_share_prices(self.holdings.keys())
         for symbol, quantity in self.holdings.items():
-            total_value += get_share_price(symbol) * quantity
+            total_value += prices.get(symbol, 0.0) * quantity
         return total_value
 
     def calculate_profit_loss(self, portfolio_value: float):
         """ Calculate profit or loss from the initial spend. """
-        initial_spend = sum(transaction.total() for transaction in self.transactions)
+        initial_spend = self._unloaded_spent + sum(transaction.total() for transaction in self.transactions)
         return portfolio_value - initial_spend - self.balance
 
     def get_holdings(self):
@@ -155,30 +299,39 @@ class Account(BaseModel):
 
     def list_transactions(self):
         """ List all transactions made by the user. """
+        self._load_transactions()
         return [transaction.model_dump() for transaction in self.transactions]
     
-    def report(self) -> str:
-        """ Return a json string representing the account.  """
+    def _report(self) -> str:
         portfolio_value = self.calculate_portfolio_value()
-        self.portfolio_value_time_series.append((datetime.now().strftime("%Y-%m-%d %H:%M:%S"), portfolio_value))
+        self.portfolio_value_time_series.append((self._now(), portfolio_value))
+        self._dirty.add("portfolio_value_time_series")
         self.save()
         pnl = self.calculate_profit_loss(portfolio_value)
-        data = self.model_dump()
+        # The full transaction list grows without bound, so the report carries only the newest ones
+        data = self.model_dump(exclude={"transactions"})
+        data["transaction_count"] = self.transaction_count()
+        data["recent_transactions"] = [t.model_dump() for t in self._recent_transactions(REPORT_TRANSACTIONS)]
         data["total_portfolio_value"] = portfolio_value
         data["total_profit_loss"] = pnl
-        write_log(self.name, "account", f"Retrieved account details")
         return json.dumps(data)
+
+    def report(self) -> str:
+        """ Return a json string representing the account.  """
+        details = self._report()
+        self._log("Retrieved account details")
+        return details
     
     def get_strategy(self) -> str:
         """ Return the strategy of the account """
-        write_log(self.name, "account", f"Retrieved strategy")
+        self._log("Retrieved strategy")
         return self.strategy
     
     def change_strategy(self, strategy: str) -> str:
         """ At your discretion, if you choose to, call this to change your investment strategy for the future """
         self.strategy = strategy
         self.save()
-        write_log(self.name, "account", f"Changed strategy")
+        self._log("Changed strategy")
         return "Changed strategy"
 
 # Example of usage:
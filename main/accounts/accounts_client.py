@@ -1,7 +1,7 @@
-import mcp
-from mcp.client.stdio import stdio_client
-from mcp import StdioServerParameters
+import asyncio
 from agents import FunctionTool
+from dotenv import load_dotenv
+from mcp.types import CallToolResult, TextContent
 import json
 import os, sys
 
@@ -10,41 +10,78 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
+from main.mcp_servers.server_pool import PooledServer
+
+load_dotenv(override=True)
+
 # Spawn the accounts server using the current interpreter as a module for robust path handling
-params = StdioServerParameters(
-    command=sys.executable,
-    args=["-m", "main.mcp_servers.accounts_server"],
-    cwd=root_dir,
-)
+params = {
+    "command": sys.executable,
+    "args": ["-m", "main.mcp_servers.accounts_server"],
+    "cwd": root_dir,
+}
+
+# Serve requests from the accounts server code in this process instead of a subprocess
+ACCOUNTS_IN_PROCESS = os.getenv("ACCOUNTS_IN_PROCESS", "false").strip().lower() in {"1", "true", "yes", "on"}
+
+# One persistent server per event loop, started on first use; its session multiplexes
+# concurrent requests, and a request that finds the connection broken restarts the server
+# and is sent again once. Entries
+# live until close_accounts_client (the server's task keeps its loop alive anyway, so a
+# weak reference would never be cleared); ones left behind by closed loops are dropped
+_servers: dict[asyncio.AbstractEventLoop, PooledServer] = {}
+
+
+def _server() -> PooledServer:
+    loop = asyncio.get_running_loop()
+    for stale in [other for other in _servers if other.is_closed()]:
+        del _servers[stale]
+    if loop not in _servers:
+        _servers[loop] = PooledServer(params)
+    return _servers[loop]
+
+
+async def close_accounts_client():
+    """Stop this event loop's accounts server, if one was started."""
+    server = _servers.pop(asyncio.get_running_loop(), None)
+    if server:
+        await server.stop()
+
+
+async def _read_resource(uri: str) -> str:
+    if ACCOUNTS_IN_PROCESS:
+        from main.mcp_servers.accounts_server import mcp as accounts_mcp
+        contents = await accounts_mcp.read_resource(uri)
+        return next(iter(contents)).content
+    result = await _server().request(lambda server: server.session.read_resource(uri))
+    return result.contents[0].text
 
 
 async def list_accounts_tools():
-    async with stdio_client(params) as streams:
-        async with mcp.ClientSession(*streams) as session:
-            await session.initialize()
-            tools_result = await session.list_tools()
-            return tools_result.tools
-        
+    if ACCOUNTS_IN_PROCESS:
+        from main.mcp_servers.accounts_server import mcp as accounts_mcp
+        return await accounts_mcp.list_tools()
+    tools_result = await _server().request(lambda server: server.session.list_tools())
+    return tools_result.tools
+
 async def call_accounts_tool(tool_name, tool_args):
-    async with stdio_client(params) as streams:
-        async with mcp.ClientSession(*streams) as session:
-            await session.initialize()
-            result = await session.call_tool(tool_name, tool_args)
-            return result
-            
+    if ACCOUNTS_IN_PROCESS:
+        from main.mcp_servers.accounts_server import mcp as accounts_mcp
+        try:
+            result = await accounts_mcp.call_tool(tool_name, tool_args)
+        except Exception as e:
+            return CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+        # FastMCP returns content blocks, or (content blocks, structured output) for typed results
+        if isinstance(result, tuple):
+            return CallToolResult(content=list(result[0]), structuredContent=result[1])
+        return CallToolResult(content=list(result))
+    return await _server().request(lambda server: server.session.call_tool(tool_name, tool_args))
+
 async def read_accounts_resource(name):
-    async with stdio_client(params) as streams:
-        async with mcp.ClientSession(*streams) as session:
-            await session.initialize()
-            result = await session.read_resource(f"accounts://accounts_server/{name}")
-            return result.contents[0].text
-        
+    return await _read_resource(f"accounts://accounts_server/{name}")
+
 async def read_strategy_resource(name):
-    async with stdio_client(params) as streams:
-        async with mcp.ClientSession(*streams) as session:
-            await session.initialize()
-            result = await session.read_resource(f"accounts://strategy/{name}")
-            return result.contents[0].text
+    return await _read_resource(f"accounts://strategy/{name}")
 
 async def get_accounts_tools_openai():
     openai_tools = []
@@ -55,7 +92,7 @@ async def get_accounts_tools_openai():
             description=tool.description,
             params_json_schema=schema,
             on_invoke_tool=lambda ctx, args, toolname=tool.name: call_accounts_tool(toolname, json.loads(args))
-                
+
         )
         openai_tools.append(openai_tool)
-    return openai_tools
\ No newline at end of file
+    return openai_tools
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.accounts.accounts import INITIAL_BALANCE
+from main.markets.market import get_recorded_share_prices
+from main.utils.database import read_account_summary
+
+
+@dataclass(frozen=True)
+class AccountSummary:
+    """
+    An account as the dashboard reads it: plain data from the read-only connections.
+
+    Unlike Account, nothing here saves, logs or appends to the portfolio history, and prices
+    come from what has already been recorded rather than a fresh lookup (which would update
+    the shared price cache), so reading it never takes the write lock the traders need.
+    """
+    name: str
+    balance: float
+    strategy: str
+    holdings: dict[str, int]
+    # Sum of quantity * price over every transaction, so the transactions themselves aren't loaded
+    spent: float
+    last_transaction_id: int
+
+    def portfolio_value(self) -> float:
+        """Cash plus holdings at the latest recorded prices (same arithmetic as Account.calculate_portfolio_value)."""
+        prices = get_recorded_share_prices(self.holdings.keys())
+        return self.balance + sum(prices.get(symbol, 0.0) * quantity for symbol, quantity in self.holdings.items())
+
+    def profit_loss(self, portfolio_value: float) -> float:
+        """Profit or loss from the initial spend (same arithmetic as Account.calculate_profit_loss)."""
+        return portfolio_value - self.spent - self.balance
+
+
+def get_account_summary(name: str) -> AccountSummary:
+    """Read an account without loading an Account; one that was never saved reads as a fresh one (and stays unsaved)."""
+    fields = read_account_summary(name)
+    if not fields:
+        return AccountSummary(
+            name=name.lower(), balance=INITIAL_BALANCE, strategy="", holdings={}, spent=0.0, last_transaction_id=0
+        )
+    return AccountSummary(**fields)
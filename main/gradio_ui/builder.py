@@ -8,9 +8,7 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from main.trading.trading_floor import (
-    names,
-    lastnames,
-    short_model_names,
+    roster,
     run_every_n_minutes,
     request_stop,
     reset_stop,
@@ -18,7 +16,11 @@ from main.trading.trading_floor import (
 from main.prompts.reset import reset_traders
 from main.utils.util import css, js
 from main.gradio_ui.styles import MODERN_CSS
-from main.gradio_ui.views import TraderView, Trader
+from main.gradio_ui.views import TraderView, Trader, get_latency_df, get_leaderboard_df
+from main.utils.model_client import model_display_name
+import main.utils.constants as constants
+
+DASHBOARD_PAGE_SIZE = constants.DASHBOARD_PAGE_SIZE
 
 # Runtime state
 trading_task = None
@@ -84,11 +86,13 @@ async def auto_stop_after_duration(seconds: int):
 def create_ui():
     """Create the main Gradio UI for the trading simulation"""
 
-    traders = [
-        Trader(trader_name, lastname, model_name)
-        for trader_name, lastname, model_name in zip(names, lastnames, short_model_names)
+    traders = [Trader(spec.name, spec.lastname, model_display_name(spec.model)) for spec in roster]
+    page_count = max(1, -(-len(traders) // DASHBOARD_PAGE_SIZE))
+    pages = [
+        (f"{page}: {' · '.join(trader.name for trader in traders[(page - 1) * DASHBOARD_PAGE_SIZE:page * DASHBOARD_PAGE_SIZE])}", page)
+        for page in range(1, page_count + 1)
     ]
-    trader_views = [TraderView(trader) for trader in traders]
+    trader_views = [TraderView(traders, slot, DASHBOARD_PAGE_SIZE) for slot in range(DASHBOARD_PAGE_SIZE)]
 
     with gr.Blocks(
         title="Traders",
@@ -102,9 +106,9 @@ def create_ui():
                 elem_classes=["subtitle"],
             )
             gr.Markdown(
-                """
+                f"""
                 <div style='text-align:center; max-width: 900px; margin: 4px auto 8px; color:#475569;'>
-                    Four autonomous traders — Value, Macro, Systematic and Crypto — compete in real time. Watch live P&L charts, holdings, and execution logs. Reset instantly to rerun strategies with a fresh slate.
+                    {len(traders)} autonomous traders compete in real time. Watch live P&L charts, holdings, and execution logs. Reset instantly to rerun strategies with a fresh slate.
                 </div>
                 """,
                 elem_classes=["subtitle"],
@@ -151,9 +155,50 @@ def create_ui():
                     elem_classes=["note"],
                 )
                 stop_button = gr.Button("Stop", variant="secondary", elem_id="stop-btn")
+            with gr.Row(visible=page_count > 1):
+                page = gr.Dropdown(
+                    choices=pages,
+                    value=1,
+                    label=f"Traders {DASHBOARD_PAGE_SIZE} per page ({len(traders)} in all)",
+                    interactive=True,
+                )
             with gr.Row():
                 for trader_view in trader_views:
-                    trader_view.make_ui()
+                    trader_view.make_ui(page, ui)
+            with gr.Accordion("Leaderboard", open=page_count > 1, visible=page_count > 1):
+                leaderboard = gr.Dataframe(
+                    value=lambda: get_leaderboard_df(traders, DASHBOARD_PAGE_SIZE),
+                    max_height=400,
+                    elem_classes=["dataframe-fix"],
+                )
+            leaderboard_timer = gr.Timer(value=120, active=page_count > 1)
+            leaderboard_timer.tick(
+                fn=lambda: get_leaderboard_df(traders, DASHBOARD_PAGE_SIZE),
+                inputs=[],
+                outputs=[leaderboard],
+                show_progress="hidden",
+                queue=False,
+            )
+            with gr.Accordion("Cycle latency (seconds)", open=False):
+                with gr.Row():
+                    latency_by_trader = gr.Dataframe(
+                        value=get_latency_df,
+                        label="By trader and span type",
+                        elem_classes=["dataframe-fix"],
+                    )
+                    latency_by_tool = gr.Dataframe(
+                        value=lambda: get_latency_df(("name",), span_type="function"),
+                        label="By tool",
+                        elem_classes=["dataframe-fix"],
+                    )
+            latency_timer = gr.Timer(value=10)
+            latency_timer.tick(
+                fn=lambda: (get_latency_df(), get_latency_df(("name",), span_type="function")),
+                inputs=[],
+                outputs=[latency_by_trader, latency_by_tool],
+                show_progress="hidden",
+                queue=False,
+            )
 
         # Start background loop after JS has already moved to the dashboard.
         async def start_trading():
@@ -169,7 +214,7 @@ def create_ui():
 
         def on_reset_click():
             try:
-                reset_traders()
+                reset_traders(roster)
                 return gr.update(
                     value="<div class='single-card'>✅ Traders have been reset successfully.</div>",
                     visible=True,
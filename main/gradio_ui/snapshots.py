@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Any, Callable
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.database import read_account_revisions
+from main.utils.metrics import registry
+
+# How often account revisions are re-read (one query for every trader, however many viewers)
+SNAPSHOT_CHECK_SECONDS = 2.0
+# Snapshots are rebuilt at least this often even without account writes, as prices move
+SNAPSHOT_MAX_AGE_SECONDS = 60.0
+
+
+class DashboardSnapshots:
+    """
+    Each trader's dashboard view model, built once and shared by every browser session.
+
+    A snapshot is rebuilt when its account's revision changes (every save bumps it, in any
+    process) or when it is older than max_age. Revisions are checked at most every
+    check_interval, and concurrent requests for a stale snapshot wait for one build, so the
+    database and price lookups cost the same for one viewer as for a hundred.
+    """
+
+    def __init__(self, check_interval: float = SNAPSHOT_CHECK_SECONDS, max_age: float = SNAPSHOT_MAX_AGE_SECONDS):
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._revisions: dict[str, int] = {}
+        self._checked = float("-inf")
+        self._entries: dict[str, tuple[int | None, float, Any]] = {}
+        self._building: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+
+    def _revision(self, name: str) -> int | None:
+        with self._check_lock:
+            if time.monotonic() - self._checked >= self.check_interval:
+                self._revisions = read_account_revisions()
+                self._checked = time.monotonic()
+            return self._revisions.get(name)
+
+    def _fresh(self, name: str, revision: int | None):
+        entry = self._entries.get(name)
+        if entry and entry[0] == revision and time.monotonic() - entry[1] < self.max_age:
+            return entry
+        return None
+
+    def get(self, name: str, build: Callable[[], Any]) -> Any:
+        """The name's current snapshot, calling build() to make a new one if it is stale."""
+        name = name.lower()
+        revision = self._revision(name)
+        with self._lock:
+            entry = self._fresh(name, revision)
+            if entry:
+                return entry[2]
+            building = self._building.setdefault(name, threading.Lock())
+        with building:
+            # Another session may have built it while this one waited
+            with self._lock:
+                entry = self._fresh(name, revision)
+            if entry:
+                return entry[2]
+            snapshot = build()
+            registry.counter("dashboard_snapshot_builds_total", "Dashboard view models built", trader=name).inc()
+            with self._lock:
+                self._entries[name] = (revision, time.monotonic(), snapshot)
+            return snapshot
+
+
+# One cache per process, shared by every dashboard column and session
+dashboard_snapshots = DashboardSnapshots()
@@ -1,6 +1,10 @@
+import asyncio
+from dataclasses import dataclass
+
 import gradio as gr
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 import os
 import sys
@@ -8,9 +12,19 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from main.accounts.accounts import Account
-from main.utils.database import read_log
+from main.accounts.accounts import INITIAL_BALANCE
+from main.accounts.queries import AccountSummary, get_account_summary
+from main.utils.database import (
+    read_portfolio_series,
+    read_latest_portfolio_values,
+    read_transactions,
+    read_transactions_after,
+    read_transaction_rationale,
+)
+from main.utils.log_feed import log_feed
+from main.gradio_ui.snapshots import dashboard_snapshots
 from main.utils.util import Color
+from main.utils.metrics import latency_summary
 
 # Map log types to colors
 MAPPER = {
@@ -22,16 +36,86 @@ MAPPER = {
     "account": Color.RED,
 }
 
+LATENCY_COLUMNS = ["count", "mean", "p50", "p95", "p99"]
+LEADERBOARD_COLUMNS = ["Rank", "Trader", "Page", "Value", "Change", "Updated"]
+TRANSACTION_COLUMNS = ["ID", "Timestamp", "Symbol", "Quantity", "Price"]
+# Transactions per page of a trader's table, newest first; "Older" loads the next page
+TRANSACTIONS_PAGE_SIZE = 20
+# Log lines shown per trader
+LOG_LINES = 13
+# How long a log stream waits for new lines before re-checking which trader its slot shows
+LOG_STREAM_RECHECK_SECONDS = 1.0
+
+
+def get_latency_df(by: tuple[str, ...] = ("trader", "type"), span_type: str | None = None) -> pd.DataFrame:
+    """Span latency percentiles (seconds) grouped by the given labels, optionally for one span type."""
+    group = by if span_type is None else ("type", *by)
+    rows = latency_summary(group)
+    if span_type is not None:
+        rows = [row for row in rows if row.pop("type") == span_type]
+    df = pd.DataFrame(rows, columns=[*by, *LATENCY_COLUMNS])
+    return df.round(3)
+
+
+def format_logs(rows) -> str:
+    """HTML for log rows as stored: (id, name, datetime, type, message)."""
+    response = ""
+    for _, _, timestamp, log_type, message in rows:
+        color = MAPPER.get(log_type, Color.WHITE).value
+        response += f"<span style='color:{color}'>{timestamp} : [{log_type}] {message}</span><br/>"
+    return f"<div style='height:250px; overflow-y:auto;'>{response}</div>"
+
+
+def get_transactions_df(rows) -> pd.DataFrame:
+    """Transaction rows as read (id, timestamp, symbol, quantity, price), newest first; rationale loads on select."""
+    df = pd.DataFrame(rows, columns=TRANSACTION_COLUMNS)
+    df["Price"] = df["Price"].round(2)
+    return df
+
+
+def get_leaderboard_df(traders: list["Trader"], page_size: int) -> pd.DataFrame:
+    """Every trader's latest recorded portfolio value, best first, with the dashboard page it is on."""
+    latest = read_latest_portfolio_values()
+    rows = []
+    for index, trader in enumerate(traders):
+        timestamp, value = latest.get(trader.name.lower(), (None, INITIAL_BALANCE))
+        rows.append([trader.name, index // page_size + 1, round(value), round(value - INITIAL_BALANCE), timestamp or ""])
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return pd.DataFrame([[rank, *row] for rank, row in enumerate(rows, 1)], columns=LEADERBOARD_COLUMNS)
+
+
+@dataclass(frozen=True)
+class TraderSnapshot:
+    """What a trader's column shows; built by Trader.build_snapshot and shared by every session."""
+    portfolio_value: float
+    pnl: float
+    chart: go.Figure
+    holdings: pd.DataFrame
+    # Sessions compare this with the newest transaction they show, and only then query
+    last_transaction_id: int
+
 
 class Trader:
     def __init__(self, name: str, lastname: str, model_name: str):
         self.name = name
         self.lastname = lastname
         self.model_name = model_name
-        self.account = Account.get(name)
 
-    def reload(self):
-        self.account = Account.get(self.name)
+    @property
+    def snapshot(self) -> TraderSnapshot:
+        # Built on first display, so a large roster doesn't read every account up front
+        return dashboard_snapshots.get(self.name, self.build_snapshot)
+
+    def build_snapshot(self) -> TraderSnapshot:
+        account = get_account_summary(self.name)
+        portfolio_value = account.portfolio_value() or 0.0
+        return TraderSnapshot(
+            portfolio_value=portfolio_value,
+            pnl=account.profit_loss(portfolio_value) or 0.0,
+            chart=self.make_portfolio_value_chart(),
+            holdings=self.make_holdings_df(account),
+            last_transaction_id=account.last_transaction_id,
+        )
 
     def get_title(self) -> str:
         return (
@@ -40,14 +124,17 @@ class Trader:
         )
 
     def get_strategy(self) -> str:
-        return self.account.get_strategy()
+        return get_account_summary(self.name).strategy
 
     def get_portfolio_value_df(self) -> pd.DataFrame:
-        df = pd.DataFrame(self.account.portfolio_value_time_series, columns=["datetime", "value"])
+        df = pd.DataFrame(read_portfolio_series(self.name), columns=["datetime", "value"])
         df["datetime"] = pd.to_datetime(df["datetime"])
         return df
 
-    def get_portfolio_value_chart(self):
+    def get_portfolio_value_chart(self) -> go.Figure:
+        return self.snapshot.chart
+
+    def make_portfolio_value_chart(self) -> go.Figure:
         df = self.get_portfolio_value_df()
         fig = px.line(df, x="datetime", y="value")
         
@@ -106,8 +193,12 @@ class Trader:
         return fig
 
     def get_holdings_df(self) -> pd.DataFrame:
+        return self.snapshot.holdings
+
+    @staticmethod
+    def make_holdings_df(account: AccountSummary) -> pd.DataFrame:
         """Convert holdings to DataFrame for display"""
-        holdings = self.account.get_holdings()
+        holdings = account.holdings
         if not holdings:
             return pd.DataFrame(columns=["Symbol", "Quantity"])
 
@@ -116,18 +207,10 @@ class Trader:
         )
         return df
 
-    def get_transactions_df(self) -> pd.DataFrame:
-        """Convert transactions to DataFrame for display"""
-        transactions = self.account.list_transactions()
-        if not transactions:
-            return pd.DataFrame(columns=["Timestamp", "Symbol", "Quantity", "Price", "Rationale"])
-
-        return pd.DataFrame(transactions)
-
     def get_portfolio_value(self) -> str:
-        """Calculate total portfolio value based on current prices"""
-        portfolio_value = self.account.calculate_portfolio_value() or 0.0
-        pnl = self.account.calculate_profit_loss(portfolio_value) or 0.0
+        """Total portfolio value and P&L at the snapshot's prices"""
+        snapshot = self.snapshot
+        portfolio_value, pnl = snapshot.portfolio_value, snapshot.pnl
         color = "green" if pnl >= 0 else "red"
         emoji = "⬆" if pnl >= 0 else "⬇"
         return (
@@ -137,41 +220,61 @@ class Trader:
         )
 
     def get_logs(self, previous=None) -> str:
-        logs = read_log(self.name, last_n=13)
-        response = ""
-        for log in logs:
-            timestamp, log_type, message = log
-            color = MAPPER.get(log_type, Color.WHITE).value
-            response += f"<span style='color:{color}'>{timestamp} : [{log_type}] {message}</span><br/>"
-        response = f"<div style='height:250px; overflow-y:auto;'>{response}</div>"
+        _, rows = log_feed.tail(self.name)
+        response = format_logs(rows[-LOG_LINES:])
         if response != previous:
             return response
         return gr.update()
 
 
 class TraderView:
-    def __init__(self, trader: Trader):
-        self.trader = trader
+    """
+    One dashboard column. It shows whichever trader falls in its slot on the selected page,
+    so only a page's worth of columns (and refresh timers) exist however many traders run.
+    Portfolio, chart and holdings come from the trader's shared snapshot, so every open session
+    refreshing costs no more than one. Each session keeps the transaction rows it shows and
+    only reads (and resends) the table when the snapshot has newer ones.
+    Log lines are pushed to each browser session from the shared log feed as they arrive.
+    """
+
+    def __init__(self, traders: list[Trader], slot: int, page_size: int):
+        self.traders = traders
+        self.slot = slot
+        self.page_size = page_size
+        self.column = None
+        self.title = None
         self.portfolio_value = None
         self.chart = None
         self.holdings_table = None
         self.transactions_table = None
+        self.older_transactions = None
+        self.rationale = None
+        # Per session: (trader name, transaction rows shown in its table newest first, pages
+        # loaded); the table keeps at most pages * TRANSACTIONS_PAGE_SIZE rows
+        self.shown_transactions = None
         self.log = None
+        # The page each connected browser session is showing, for its log stream
+        self._pages: dict[str, int] = {}
+
+    def trader(self, page) -> Trader | None:
+        index = (int(page or 1) - 1) * self.page_size + self.slot
+        return self.traders[index] if 0 <= index < len(self.traders) else None
 
-    def make_ui(self):
-        with gr.Column():
-            gr.HTML(self.trader.get_title())
+    def make_ui(self, page: gr.components.Component, blocks: gr.Blocks):
+        first = self.trader(1)
+        with gr.Column(visible=first is not None) as self.column:
+            self.title = gr.HTML(first.get_title() if first else "")
             with gr.Row():
-                self.portfolio_value = gr.HTML(self.trader.get_portfolio_value)
+                self.portfolio_value = gr.HTML(first.get_portfolio_value if first else "")
             with gr.Row():
                 self.chart = gr.Plot(
-                    self.trader.get_portfolio_value_chart, container=True, show_label=False
+                    first.get_portfolio_value_chart if first else None, container=True, show_label=False
                 )
             with gr.Row(variant="panel"):
-                self.log = gr.HTML(self.trader.get_logs)
+                self.log = gr.HTML(first.get_logs if first else "")
             with gr.Row():
                 self.holdings_table = gr.Dataframe(
-                    value=self.trader.get_holdings_df,
+                    value=first.get_holdings_df if first else None,
                     label="Holdings",
                     headers=["Symbol", "Quantity"],
                     row_count=(5, "dynamic"),
@@ -181,41 +284,161 @@ class TraderView:
                 )
             with gr.Row():
                 self.transactions_table = gr.Dataframe(
-                    value=self.trader.get_transactions_df,
                     label="Recent Transactions",
-                    headers=["Timestamp", "Symbol", "Quantity", "Price", "Rationale"],
+                    headers=TRANSACTION_COLUMNS,
                     row_count=(5, "dynamic"),
-                    column_count=5,
+                    column_count=len(TRANSACTION_COLUMNS),
+                    max_height=300,
                     elem_classes=["dataframe-fix"],
                 )
+            with gr.Row():
+                self.older_transactions = gr.Button("Older transactions", size="sm")
+            with gr.Row():
+                self.rationale = gr.Textbox(
+                    label="Rationale",
+                    placeholder="Select a transaction to see its rationale",
+                    lines=2,
+                    interactive=False,
+                )
+            self.shown_transactions = gr.State(None)
 
+        outputs = [
+            self.column,
+            self.title,
+            self.portfolio_value,
+            self.chart,
+            self.holdings_table,
+            self.log,
+            self.transactions_table,
+            self.shown_transactions,
+            self.rationale,
+        ]
+        transaction_outputs = [self.transactions_table, self.shown_transactions, self.rationale]
         timer = gr.Timer(value=120)
         timer.tick(
             fn=self.refresh,
-            inputs=[],
-            outputs=[
-                self.portfolio_value,
-                self.chart,
-                self.holdings_table,
-                self.transactions_table,
-            ],
+            inputs=[page, self.shown_transactions],
+            outputs=outputs,
             show_progress="hidden",
             queue=False,
         )
-        log_timer = gr.Timer(value=0.5)
-        log_timer.tick(
-            fn=self.trader.get_logs,
-            inputs=[self.log],
-            outputs=[self.log],
+        page.change(
+            fn=self.refresh,
+            inputs=[page, self.shown_transactions],
+            outputs=outputs,
+            show_progress="hidden",
+            queue=False,
+        )
+        blocks.load(
+            fn=self.update_transactions,
+            inputs=[page, self.shown_transactions],
+            outputs=transaction_outputs,
+            show_progress="hidden",
+            queue=False,
+        )
+        self.older_transactions.click(
+            fn=self.load_older_transactions,
+            inputs=[page, self.shown_transactions],
+            outputs=[self.transactions_table, self.shown_transactions],
+            show_progress="hidden",
+            queue=False,
+        )
+        self.transactions_table.select(
+            fn=self.show_rationale,
+            inputs=[self.shown_transactions],
+            outputs=[self.rationale],
             show_progress="hidden",
             queue=False,
         )
+        # One long-lived stream per session; it never holds a worker while waiting
+        blocks.load(
+            fn=self.stream_logs,
+            inputs=[page],
+            outputs=[self.log],
+            show_progress="hidden",
+            concurrency_limit=None,
+        )
+        blocks.unload(self.forget_session)
+
+    async def stream_logs(self, page, request: gr.Request):
+        """Send this slot's log lines to one session whenever they change, until it disconnects."""
+        session = request.session_hash
+        self._pages[session] = page
+        shown = None
+        while session in self._pages:
+            trader = self.trader(self._pages.get(session, page))
+            if trader is None:
+                await asyncio.sleep(LOG_STREAM_RECHECK_SECONDS)
+                continue
+            seen = shown[1] if shown and shown[0] == trader.name else None
+            version, rows = await log_feed.wait(trader.name, seen, LOG_STREAM_RECHECK_SECONDS)
+            # The page may have changed while waiting; the next pass follows the new trader
+            if self.trader(self._pages.get(session, page)) is trader and shown != (trader.name, version):
+                shown = (trader.name, version)
+                yield format_logs(rows[-LOG_LINES:])
 
-    def refresh(self):
-        self.trader.reload()
+    def forget_session(self, request: gr.Request):
+        self._pages.pop(request.session_hash, None)
+
+    def refresh(self, page, shown=None, request: gr.Request = None):
+        if request is not None and request.session_hash in self._pages:
+            self._pages[request.session_hash] = page
+        trader = self.trader(page)
+        if trader is None:
+            return (gr.update(visible=False), *[gr.update()] * 6, shown, gr.update())
+        snapshot = trader.snapshot
         return (
-            self.trader.get_portfolio_value(),
-            self.trader.get_portfolio_value_chart(),
-            self.trader.get_holdings_df(),
-            self.trader.get_transactions_df(),
+            gr.update(visible=True),
+            trader.get_title(),
+            trader.get_portfolio_value(),
+            snapshot.chart,
+            snapshot.holdings,
+            trader.get_logs(),
+            *self.update_transactions(page, shown),
         )
+
+    def update_transactions(self, page, shown):
+        """
+        The transactions table, its session state and the rationale box for this slot's trader.
+
+        A session already showing the trader's newest transaction gets no update at all; one
+        behind reads only the transactions after its newest row and adds them on top, dropping
+        the oldest rows so the table stays within the pages the session has loaded.
+        """
+        trader = self.trader(page)
+        if trader is None:
+            return gr.update(), shown, gr.update()
+        name = trader.name.lower()
+        latest = trader.snapshot.last_transaction_id
+        if shown and shown[0] == name:
+            _, rows, pages = shown
+            window = pages * TRANSACTIONS_PAGE_SIZE
+            newest = rows[0][0] if rows else 0
+            if latest == newest:
+                return gr.update(), shown, gr.update()
+            # Ids only grow, unless the history was rewritten (a reset); then start over
+            if latest > newest and (not rows or read_transactions(name, newest + 1, 1)[:1] == rows[:1]):
+                added = read_transactions_after(name, newest, window)
+                # A whole window of new rows may not reach the ones shown; read the newest instead
+                rows = (added + rows)[:window] if len(added) < window else read_transactions(name, limit=window)
+                return get_transactions_df(rows), (name, rows, pages), gr.update()
+        rows = read_transactions(name, limit=TRANSACTIONS_PAGE_SIZE)
+        return get_transactions_df(rows), (name, rows, 1), ""
+
+    def load_older_transactions(self, page, shown):
+        """Add the next page of older transactions below the ones this session shows."""
+        trader = self.trader(page)
+        if trader is None or not shown or shown[0] != trader.name.lower() or not shown[1]:
+            return gr.update(), shown
+        name, rows, pages = shown
+        older = read_transactions(name, rows[-1][0], TRANSACTIONS_PAGE_SIZE)
+        if not older:
+            return gr.update(), shown
+        rows = rows + older
+        return get_transactions_df(rows), (name, rows, pages + 1)
+
+    def show_rationale(self, shown, evt: gr.SelectData) -> str:
+        """Read the selected transaction's rationale, which the table leaves out."""
+        if not shown or evt.index is None or evt.index[0] >= len(shown[1]):
+            return ""
+        return read_transaction_rationale(shown[1][evt.index[0]][0]) or ""
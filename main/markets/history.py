@@ -0,0 +1,89 @@
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.markets.market import get_grouped_daily_bars, market_calendar
+from main.markets.market_calendar import NYSE_TZ
+from main.utils.database import write_bars, read_bars, read_closes, read_bar_dates
+
+# How far back top_up_bars looks for the newest stored bar
+DEFAULT_BACKFILL_DAYS = 365
+# Pause between grouped-daily requests so a long backfill stays inside free-plan rate limits
+REQUEST_PAUSE_SECONDS = float(os.getenv("BARS_REQUEST_PAUSE_SECONDS", "12"))
+
+
+def trading_days(start: date, end: date) -> list[date]:
+    """Days between start and end (inclusive) with a regular NYSE session."""
+    days = []
+    day = start
+    while day <= end:
+        if market_calendar.session(day):
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def last_completed_session(now: datetime | None = None) -> date:
+    """The most recent trading day whose session has already closed."""
+    now = now or datetime.now(NYSE_TZ)
+    day = now.date()
+    while True:
+        session = market_calendar.session(day)
+        if session and session[1] <= now:
+            return day
+        day -= timedelta(days=1)
+
+
+def backfill_bars(start: date, end: date | None = None, pause: float = REQUEST_PAUSE_SECONDS) -> int:
+    """
+    Fetch grouped-daily bars for every trading day in [start, end] that is not stored yet.
+
+    Returns the number of days fetched.
+    """
+    end = end or last_completed_session()
+    stored = set(read_bar_dates(start.isoformat(), end.isoformat()))
+    missing = [day for day in trading_days(start, end) if day.isoformat() not in stored]
+    for i, day in enumerate(missing):
+        if i and pause:
+            time.sleep(pause)
+        rows = get_grouped_daily_bars(day)
+        write_bars(rows)
+        print(f"Stored {len(rows)} bars for {day}")
+    return len(missing)
+
+
+def top_up_bars(pause: float = REQUEST_PAUSE_SECONDS) -> int:
+    """Fetch whatever trading days are missing since the newest stored bar (or the last week)."""
+    end = last_completed_session()
+    recent = read_bar_dates((end - timedelta(days=DEFAULT_BACKFILL_DAYS)).isoformat(), end.isoformat())
+    start = date.fromisoformat(recent[-1]) + timedelta(days=1) if recent else end - timedelta(days=7)
+    return backfill_bars(start, end, pause)
+
+
+def get_price_history(symbols: list[str], start: str, end: str) -> dict[str, list[tuple[str, float]]]:
+    """Closing prices per symbol between two 'YYYY-MM-DD' dates, served from the local store."""
+    return read_closes(symbols, start, end)
+
+
+def get_bars(symbols: list[str], start: str, end: str) -> dict[str, list[tuple]]:
+    """(date, open, high, low, close, volume) bars per symbol between two 'YYYY-MM-DD' dates."""
+    return read_bars(symbols, start, end)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill or top up the local daily bar history")
+    parser.add_argument("--start", type=date.fromisoformat, help="first day to backfill (default: top up)")
+    parser.add_argument("--end", type=date.fromisoformat, help="last day to backfill (default: last close)")
+    parser.add_argument("--pause", type=float, default=REQUEST_PAUSE_SECONDS, help="seconds between requests")
+    args = parser.parse_args()
+    if args.start:
+        fetched = backfill_bars(args.start, args.end, args.pause)
+    else:
+        fetched = top_up_bars(args.pause)
+    print(f"Fetched {fetched} trading days")
@@ -1,8 +1,7 @@
-from polygon import RESTClient
 from dotenv import load_dotenv
 import os
-from datetime import datetime
-import random
+import time
+from datetime import date, datetime
 from functools import lru_cache
 from datetime import timezone
 
@@ -12,7 +11,14 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from main.utils.database import write_market, read_market
+from main.utils.database import write_prices, read_prices, write_bars, MEMORY_DIR
+from main.markets.snapshot_store import MarketSnapshot, load_snapshot, prune_snapshots, write_snapshot
+from main.markets.price_cache import PriceCache
+from main.markets.polygon_client import get_client
+from main.markets.market_calendar import MarketCalendar, NYSE_TZ, HolidayOverrides
+from main.markets.providers import PriceProvider, CachedPriceProvider, SimulatedPriceProvider
+from main.markets.simulator import MarketSimulator
+from main.utils.metrics import registry
 
 load_dotenv(override=True)
 
@@ -22,31 +28,117 @@ polygon_plan = os.getenv("POLYGON_PLAN")
 is_paid_polygon = polygon_plan == "paid"
 is_realtime_polygon = polygon_plan == "realtime"
 
+# Memory-mapped EOD snapshots, shared zero-copy by every process that prices shares
+SNAPSHOT_DIR = os.path.join(MEMORY_DIR, "market")
+os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+# Older days' snapshots are deleted when a new one is written
+MARKET_SNAPSHOTS_KEPT = 3
 
-def is_market_open() -> bool:
-    client = RESTClient(polygon_api_key)
+# How long a looked-up price stays fresh: the plan's own data delay, overridable from the env
+PLAN_DATA_DELAY_SECONDS = {"paid": 15 * 60, "realtime": 0}
+EOD_PRICE_TTL_SECONDS = 60 * 60
+PRICE_CACHE_TTL_SECONDS = float(
+    os.getenv("PRICE_CACHE_TTL_SECONDS", PLAN_DATA_DELAY_SECONDS.get(polygon_plan, EOD_PRICE_TTL_SECONDS))
+)
+PRICE_CACHE_SIZE = int(os.getenv("PRICE_CACHE_SIZE", "4096"))
+
+# Shared by everything that prices shares in this process; the prices table shares it across processes
+price_cache = PriceCache(
+    PRICE_CACHE_TTL_SECONDS,
+    maxsize=PRICE_CACHE_SIZE,
+    store_read=read_prices,
+    store_write=write_prices,
+)
+
+
+def _collect_price_cache_metrics(metrics):
+    for result, count in price_cache.stats().items():
+        if result != "size":
+            metrics.counter("price_cache_requests_total", "Price cache lookups by outcome", result=result).set(count)
+    metrics.gauge("price_cache_entries", "Symbols held in the in-process price cache").set(price_cache.stats()["size"])
+
+
+registry.add_collector(_collect_price_cache_metrics)
+
+# Offline market: the same seed gives every process the same prices at the same moment
+SIMULATOR_SEED = int(os.getenv("SIMULATOR_SEED", "0"))
+SIMULATOR_TICK_SECONDS = float(os.getenv("SIMULATOR_TICK_SECONDS", "1"))
+simulated_provider = SimulatedPriceProvider(
+    MarketSimulator(seed=SIMULATOR_SEED, tick_seconds=SIMULATOR_TICK_SECONDS)
+)
+
+
+def get_market_status_polygon() -> bool:
+    client = get_client()
     market_status = client.get_market_status()
     return market_status.market == "open"
 
 
+def get_market_holidays_polygon() -> HolidayOverrides:
+    client = get_client()
+    overrides = {}
+    for holiday in client.get_market_holidays():
+        if holiday.exchange != "NYSE":
+            continue
+        day = date.fromisoformat(holiday.date)
+        if holiday.status == "early-close" and holiday.close:
+            close = datetime.fromisoformat(holiday.close.replace("Z", "+00:00"))
+            overrides[day] = close.astimezone(NYSE_TZ).time()
+        else:
+            overrides[day] = None
+    return overrides
+
+
+# Without an API key the calendar runs purely on the built-in NYSE schedule
+market_calendar = MarketCalendar(
+    fetch_status=get_market_status_polygon if polygon_api_key else None,
+    fetch_holidays=get_market_holidays_polygon if polygon_api_key else None,
+)
+
+
+def is_market_open() -> bool:
+    return market_calendar.is_open()
+
+
+def seconds_until_market_open() -> float:
+    return market_calendar.seconds_until_open()
+
+
+def get_grouped_daily_bars(day) -> list[tuple]:
+    """All tickers' OHLCV for one trading day, as rows for the bars table."""
+    client = get_client()
+    results = client.get_grouped_daily_aggs(day, adjusted=True, include_otc=False)
+    day = str(day)
+    return [
+        (result.ticker, day, result.open, result.high, result.low, result.close, result.volume)
+        for result in results
+        if result.ticker and result.close is not None
+    ]
+
+
 def get_all_share_prices_polygon_eod() -> dict[str, float]:
     """With much thanks to student Reema R. for fixing the timezone issue with this!"""
-    client = RESTClient(polygon_api_key)
+    client = get_client()
 
     probe = client.get_previous_close_agg("SPY")[0]
     last_close = datetime.fromtimestamp(probe.timestamp / 1000, tz=timezone.utc).date()
 
-    results = client.get_grouped_daily_aggs(last_close, adjusted=True, include_otc=False)
-    return {result.ticker: result.close for result in results}
+    bars = get_grouped_daily_bars(last_close)
+    # The same grouped request tops up the bar history under its real trading date
+    write_bars(bars)
+    return {symbol: close for symbol, _, _, _, _, close, _ in bars}
 
 
 @lru_cache(maxsize=2)
-def get_market_for_prior_date(today):
-    market_data = read_market(today)
-    if not market_data:
-        market_data = get_all_share_prices_polygon_eod()
-        write_market(today, market_data)
-    return market_data
+def get_market_for_prior_date(today) -> MarketSnapshot:
+    path = os.path.join(SNAPSHOT_DIR, f"eod-{today}.snap")
+    snapshot = load_snapshot(path)
+    if snapshot is None:
+        # The grouped request also stores the day's bars, the durable copy of these closes
+        write_snapshot(path, get_all_share_prices_polygon_eod())
+        prune_snapshots(SNAPSHOT_DIR, "eod-", MARKET_SNAPSHOTS_KEPT)
+        snapshot = MarketSnapshot(path)
+    return snapshot
 
 
 def get_share_price_polygon_eod(symbol) -> float:
@@ -56,11 +148,29 @@ def get_share_price_polygon_eod(symbol) -> float:
 
 
 def get_share_price_polygon_min(symbol) -> float:
-    client = RESTClient(polygon_api_key)
+    client = get_client()
     result = client.get_snapshot_ticker("stocks", symbol)
     return result.min.close or result.prev_day.close
 
 
+def get_share_prices_polygon_min(symbols: list[str]) -> dict[str, float]:
+    """One grouped snapshot request for every symbol instead of one request each."""
+    client = get_client()
+    snapshots = client.get_snapshot_all("stocks", tickers=symbols)
+    prices = {}
+    for snapshot in snapshots:
+        minute_close = snapshot.min.close if snapshot.min else None
+        prev_close = snapshot.prev_day.close if snapshot.prev_day else None
+        prices[snapshot.ticker] = minute_close or prev_close or 0.0
+    return {symbol: prices.get(symbol, 0.0) for symbol in symbols}
+
+
+def get_share_prices_polygon_eod(symbols: list[str]) -> dict[str, float]:
+    today = datetime.now().date().strftime("%Y-%m-%d")
+    market_data = get_market_for_prior_date(today)
+    return {symbol: market_data.get(symbol, 0.0) for symbol in symbols}
+
+
 def get_share_price_polygon(symbol) -> float:
     if is_paid_polygon:
         return get_share_price_polygon_min(symbol)
@@ -68,10 +178,82 @@ def get_share_price_polygon(symbol) -> float:
         return get_share_price_polygon_eod(symbol)
 
 
-def get_share_price(symbol) -> float:
-    if polygon_api_key:
+def get_share_prices_polygon(symbols: list[str]) -> dict[str, float]:
+    if is_paid_polygon:
+        return get_share_prices_polygon_min(symbols)
+    else:
+        return get_share_prices_polygon_eod(symbols)
+
+
+def fetch_share_prices_polygon(symbols: list[str]) -> dict[str, float]:
+    if len(symbols) == 1:
+        return {symbols[0]: get_share_price_polygon(symbols[0])}
+    return get_share_prices_polygon(symbols)
+
+
+polygon_provider = CachedPriceProvider("polygon", fetch_share_prices_polygon, price_cache)
+price_providers: dict[str, PriceProvider] = {
+    "polygon": polygon_provider,
+    "simulated": simulated_provider,
+}
+
+# Polygon when a key is set, otherwise the simulator; PRICE_PROVIDER forces either one
+PRICE_PROVIDER = os.getenv("PRICE_PROVIDER") or ("polygon" if polygon_api_key else "simulated")
+if PRICE_PROVIDER not in price_providers:
+    raise ValueError(f"Unknown PRICE_PROVIDER {PRICE_PROVIDER!r}; expected one of {sorted(price_providers)}")
+price_provider = price_providers[PRICE_PROVIDER]
+
+
+def set_price_provider(provider: PriceProvider) -> None:
+    """Swap where this process gets its prices from (e.g. a historical provider for replays)."""
+    global price_provider
+    price_provider = provider
+
+
+def get_share_prices(symbols) -> dict[str, float]:
+    """Resolve many symbols at once from the configured provider, falling back to the simulator."""
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    provider = price_provider
+    start = time.perf_counter()
+    if provider is not simulated_provider:
         try:
-            return get_share_price_polygon(symbol)
+            prices = provider.get_prices(symbols)
+            if provider.instrumented:
+                _record_price_lookup(provider.name, len(symbols), start)
+            return prices
         except Exception as e:
-            print(f"Was not able to use the polygon API due to {e}; using a random number")
-    return float(random.randint(1, 100))
+            registry.counter("price_provider_errors_total", "Failed price lookups", provider=provider.name).inc()
+            print(f"Was not able to use the {provider.name} price provider due to {e}; using simulated prices")
+    prices = simulated_provider.get_prices(symbols)
+    _record_price_lookup(simulated_provider.name, len(symbols), start)
+    return prices
+
+
+def get_recorded_share_prices(symbols) -> dict[str, float]:
+    """
+    Prices for callers that must not fetch or write anything, such as the dashboard.
+
+    The simulator is computed as usual. Otherwise each symbol gets the latest price any
+    process has recorded in the shared prices table, however old (traders price what they
+    hold every time they trade or report), and 0.0 if nobody has priced it yet.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    if price_provider is simulated_provider:
+        return simulated_provider.get_prices(symbols)
+    recorded = read_prices(symbols, 0)
+    return {symbol: recorded[symbol][1] if symbol in recorded else 0.0 for symbol in symbols}
+
+
+def _record_price_lookup(provider: str, symbols: int, start: float) -> None:
+    registry.histogram(
+        "price_lookup_duration_seconds", "Wall time of a get_share_price(s) call", provider=provider
+    ).observe(time.perf_counter() - start)
+    registry.counter("price_lookups_total", "Symbols priced", provider=provider).inc(symbols)
+
+
+def get_share_price(symbol) -> float:
+    return get_share_prices([symbol])[symbol]
@@ -0,0 +1,191 @@
+import threading
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+NYSE_TZ = ZoneInfo("America/New_York")
+REGULAR_OPEN = time(9, 30)
+REGULAR_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+# How long to trust a live status that contradicts the built-in schedule
+STATUS_TTL_SECONDS = 15 * 60
+HOLIDAYS_TTL_SECONDS = 24 * 60 * 60
+
+# Exchange-provided overrides: {day: None} for a closure, {day: close_time} for an early close
+HolidayOverrides = dict[date, time | None]
+
+
+def _observed(day: date) -> date:
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth given weekday of a month (n=-1 for the last one)."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+@lru_cache(maxsize=16)
+def nyse_holidays(year: int) -> dict[date, str]:
+    """Full-day NYSE closures for a year, following the exchange's weekend observance rules."""
+    holidays = {
+        _nth_weekday(year, 1, 0, 3): "Martin Luther King Jr. Day",
+        _nth_weekday(year, 2, 0, 3): "Washington's Birthday",
+        _easter(year) - timedelta(days=2): "Good Friday",
+        _nth_weekday(year, 5, 0, -1): "Memorial Day",
+        _observed(date(year, 7, 4)): "Independence Day",
+        _nth_weekday(year, 9, 0, 1): "Labor Day",
+        _nth_weekday(year, 11, 3, 4): "Thanksgiving Day",
+        _observed(date(year, 12, 25)): "Christmas Day",
+    }
+    # A Saturday New Year's Day is not observed on the previous Friday
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays[_observed(new_year)] = "New Year's Day"
+    if year >= 2022:
+        holidays[_observed(date(year, 6, 19))] = "Juneteenth"
+    return holidays
+
+
+@lru_cache(maxsize=16)
+def nyse_early_closes(year: int) -> set[date]:
+    """Days the NYSE closes at 1pm: before Independence Day, after Thanksgiving, Christmas Eve."""
+    candidates = [
+        date(year, 7, 3),
+        _nth_weekday(year, 11, 3, 4) + timedelta(days=1),
+        date(year, 12, 24),
+    ]
+    return {day for day in candidates if day.weekday() < 5 and day not in nyse_holidays(year)}
+
+
+class MarketCalendar:
+    """
+    Answers "is the market open?" and "when does it next open?" without polling.
+
+    The built-in NYSE hours and holiday rules are always available. When fetchers are given,
+    upcoming exchange holidays are merged in once a day, and the live status is fetched once
+    and cached until the next scheduled open/close (or for STATUS_TTL_SECONDS when it
+    disagrees with the schedule, e.g. an unscheduled closure).
+    Any fetch failure falls back to the built-in schedule.
+    """
+
+    def __init__(
+        self,
+        fetch_status: Callable[[], bool] | None = None,
+        fetch_holidays: Callable[[], HolidayOverrides] | None = None,
+        status_ttl: float = STATUS_TTL_SECONDS,
+        holidays_ttl: float = HOLIDAYS_TTL_SECONDS,
+    ):
+        self._fetch_status = fetch_status
+        self._fetch_holidays = fetch_holidays
+        self.status_ttl = timedelta(seconds=status_ttl)
+        self.holidays_ttl = timedelta(seconds=holidays_ttl)
+        self._overrides: HolidayOverrides = {}
+        self._overrides_expire: datetime | None = None
+        self._status: bool | None = None
+        self._status_expires: datetime | None = None
+        self._lock = threading.Lock()
+
+    def _now(self, now: datetime | None) -> datetime:
+        return now.astimezone(NYSE_TZ) if now else datetime.now(NYSE_TZ)
+
+    def _refresh_overrides(self, now: datetime) -> None:
+        if not self._fetch_holidays or (self._overrides_expire and now < self._overrides_expire):
+            return
+        try:
+            self._overrides = self._fetch_holidays()
+        except Exception as e:
+            print(f"Could not fetch market holidays due to {e}; using the built-in NYSE calendar")
+        self._overrides_expire = now + self.holidays_ttl
+
+    def session(self, day: date) -> tuple[datetime, datetime] | None:
+        """Regular-session open and close for a day, or None if the market is closed all day."""
+        if day.weekday() >= 5 or day in nyse_holidays(day.year):
+            return None
+        close = EARLY_CLOSE if day in nyse_early_closes(day.year) else REGULAR_CLOSE
+        if day in self._overrides:
+            close = self._overrides[day]
+            if close is None:
+                return None
+        return (
+            datetime.combine(day, REGULAR_OPEN, tzinfo=NYSE_TZ),
+            datetime.combine(day, close, tzinfo=NYSE_TZ),
+        )
+
+    def is_open_by_schedule(self, now: datetime | None = None) -> bool:
+        now = self._now(now)
+        session = self.session(now.date())
+        return session is not None and session[0] <= now < session[1]
+
+    def next_open(self, now: datetime | None = None) -> datetime:
+        """The next regular-session open strictly after now (today's, if it is still ahead)."""
+        now = self._now(now)
+        self._refresh_overrides(now)
+        day = now.date()
+        # Runs of closed days are never longer than a long weekend plus a holiday
+        for _ in range(14):
+            session = self.session(day)
+            if session and session[0] > now:
+                return session[0]
+            day += timedelta(days=1)
+        raise RuntimeError(f"No market session found in the two weeks after {now}")
+
+    def next_close(self, now: datetime | None = None) -> datetime:
+        now = self._now(now)
+        self._refresh_overrides(now)
+        session = self.session(now.date())
+        if session and now < session[1]:
+            return session[1]
+        return self.session(self.next_open(now).date())[1]
+
+    def is_open(self, now: datetime | None = None) -> bool:
+        now = self._now(now)
+        with self._lock:
+            if self._status is not None and now < self._status_expires:
+                return self._status
+            self._refresh_overrides(now)
+            status = None
+            if self._fetch_status:
+                try:
+                    status = bool(self._fetch_status())
+                except Exception as e:
+                    print(f"Could not fetch market status due to {e}; using the built-in NYSE calendar")
+            if status is None:
+                status = self.is_open_by_schedule(now)
+            scheduled = self.is_open_by_schedule(now)
+            if status == scheduled:
+                # Live status agrees with the schedule: nothing to ask until the next open/close
+                self._status_expires = self.next_close(now) if scheduled else self.next_open(now)
+            else:
+                self._status_expires = now + self.status_ttl
+            self._status = status
+            return status
+
+    def seconds_until_open(self, now: datetime | None = None) -> float:
+        """0 while the market is open, otherwise how long until the next regular open."""
+        now = self._now(now)
+        if self.is_open(now):
+            return 0.0
+        return max(0.0, (self.next_open(now) - now).total_seconds())
@@ -0,0 +1,76 @@
+import os
+import threading
+
+import certifi
+import urllib3
+from dotenv import load_dotenv
+from polygon import RESTClient
+from urllib3.util.retry import Retry
+
+load_dotenv(override=True)
+
+POLYGON_BASE_URL = os.getenv("POLYGON_BASE_URL", "https://api.polygon.io")
+# Keep-alive connections kept per host; extra concurrent requests open short-lived ones
+POLYGON_POOL_SIZE = int(os.getenv("POLYGON_POOL_SIZE", "10"))
+POLYGON_CONNECT_TIMEOUT = float(os.getenv("POLYGON_CONNECT_TIMEOUT", "5"))
+POLYGON_READ_TIMEOUT = float(os.getenv("POLYGON_READ_TIMEOUT", "15"))
+POLYGON_RETRIES = int(os.getenv("POLYGON_RETRIES", "3"))
+# Exponential backoff between retries: factor * 2 ** (retry - 1) seconds, honouring Retry-After
+POLYGON_BACKOFF_FACTOR = float(os.getenv("POLYGON_BACKOFF_FACTOR", "0.5"))
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+
+def create_client(
+    api_key: str | None = None,
+    base: str = POLYGON_BASE_URL,
+    pool_size: int = POLYGON_POOL_SIZE,
+    connect_timeout: float = POLYGON_CONNECT_TIMEOUT,
+    read_timeout: float = POLYGON_READ_TIMEOUT,
+    retries: int = POLYGON_RETRIES,
+    backoff_factor: float = POLYGON_BACKOFF_FACTOR,
+) -> RESTClient:
+    """
+    Build a RESTClient backed by a keep-alive connection pool.
+
+    RESTClient creates its own urllib3.PoolManager with a fixed backoff, one connection per
+    host and no request timeout, so it is replaced here with a pool whose size, timeouts
+    and retry policy come from the settings above.
+    """
+    client = RESTClient(
+        api_key or os.getenv("POLYGON_API_KEY"),
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        retries=retries,
+        base=base,
+    )
+    client.client = urllib3.PoolManager(
+        maxsize=pool_size,
+        headers=client.headers,
+        ca_certs=certifi.where(),
+        cert_reqs="CERT_REQUIRED",
+        timeout=urllib3.Timeout(connect=connect_timeout, read=read_timeout),
+        retries=Retry(
+            total=retries,
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=backoff_factor,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    return client
+
+
+_client: RESTClient | None = None
+_client_pid: int | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> RESTClient:
+    """Return this process's shared client, creating it on first use."""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = create_client()
+                _client_pid = os.getpid()
+    return _client
@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Iterable
+
+Fetch = Callable[[list[str]], dict[str, float]]
+
+
+class PriceCache:
+    """
+    In-process TTL cache for share prices with LRU eviction and request coalescing.
+
+    Symbols that are already being fetched by another caller are waited on instead of
+    fetched again. An optional shared store (read(symbols, since) / write(prices, at))
+    sits behind the in-memory tier so separate processes reuse each other's lookups;
+    store_read returns {symbol: (fetched_at, price)} for entries fetched after `since`.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        maxsize: int = 4096,
+        store_read: Callable[[list[str], float], dict[str, tuple[float, float]]] | None = None,
+        store_write: Callable[[dict[str, float], float], None] | None = None,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._store_read = store_read
+        self._store_write = store_write
+        self._entries: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.store_hits = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "store_hits": self.store_hits,
+            "size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _put(self, prices: dict[str, float], fetched_at: float) -> None:
+        for symbol, price in prices.items():
+            self._entries[symbol] = (fetched_at, price)
+            self._entries.move_to_end(symbol)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_many(self, symbols: Iterable[str], fetch: Fetch) -> dict[str, float]:
+        """Return prices for symbols, calling fetch once for whatever nobody has cached or requested."""
+        symbols = list(dict.fromkeys(symbols))
+        now = time.time()
+        result: dict[str, float] = {}
+        waiting: dict[str, Future] = {}
+        owned: dict[str, Future] = {}
+        with self._lock:
+            for symbol in symbols:
+                entry = self._entries.get(symbol)
+                if entry and now - entry[0] < self.ttl:
+                    self._entries.move_to_end(symbol)
+                    result[symbol] = entry[1]
+                    self.hits += 1
+                elif symbol in self._in_flight:
+                    waiting[symbol] = self._in_flight[symbol]
+                    self.coalesced += 1
+                else:
+                    owned[symbol] = self._in_flight[symbol] = Future()
+                    self.misses += 1
+        if owned:
+            try:
+                prices = self._load(list(owned), now, fetch)
+            except BaseException as e:
+                with self._lock:
+                    for symbol, future in owned.items():
+                        self._in_flight.pop(symbol, None)
+                        future.set_exception(e)
+                raise
+            with self._lock:
+                for symbol, future in owned.items():
+                    self._in_flight.pop(symbol, None)
+                    future.set_result(prices.get(symbol, 0.0))
+            for symbol in owned:
+                result[symbol] = prices.get(symbol, 0.0)
+        for symbol, future in waiting.items():
+            result[symbol] = future.result()
+        return {symbol: result[symbol] for symbol in symbols}
+
+    def _load(self, symbols: list[str], now: float, fetch: Fetch) -> dict[str, float]:
+        stored: dict[str, tuple[float, float]] = {}
+        if self._store_read:
+            try:
+                stored = self._store_read(symbols, now - self.ttl)
+                self.store_hits += len(stored)
+            except Exception as e:
+                print(f"Could not read shared price cache: {e}")
+        prices = {symbol: price for symbol, (_, price) in stored.items()}
+        missing = [symbol for symbol in symbols if symbol not in stored]
+        fetched: dict[str, float] = {}
+        if missing:
+            fetched = fetch(missing)
+            if self._store_write:
+                try:
+                    self._store_write(fetched, time.time())
+                except Exception as e:
+                    print(f"Could not update shared price cache: {e}")
+            prices.update(fetched)
+        with self._lock:
+            # Shared-store hits keep their original fetch time so they expire on schedule
+            for symbol, (fetched_at, price) in stored.items():
+                self._put({symbol: price}, fetched_at)
+            self._put(fetched, time.time())
+        return prices
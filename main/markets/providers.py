@@ -0,0 +1,45 @@
+from typing import Callable
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.markets.price_cache import PriceCache
+from main.markets.simulator import MarketSimulator
+
+
+class PriceProvider:
+    """A source of share prices. Every provider answers a whole batch of symbols in one call."""
+
+    name = "provider"
+    # Whether lookups count towards the live price metrics (replays serving history opt out)
+    instrumented = True
+
+    def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        raise NotImplementedError
+
+
+class CachedPriceProvider(PriceProvider):
+    """Prices from a remote fetch(symbols) function, served through a PriceCache."""
+
+    def __init__(self, name: str, fetch: Callable[[list[str]], dict[str, float]], cache: PriceCache):
+        self.name = name
+        self.fetch = fetch
+        self.cache = cache
+
+    def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        return self.cache.get_many(symbols, self.fetch)
+
+
+class SimulatedPriceProvider(PriceProvider):
+    """Offline prices from a seeded MarketSimulator, evolving with the wall clock."""
+
+    name = "simulated"
+
+    def __init__(self, simulator: MarketSimulator):
+        self.simulator = simulator
+
+    def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        return self.simulator.get_prices(symbols)
@@ -0,0 +1,133 @@
+import time
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+# 2 ** TREE_DEPTH ticks per path: with one-second ticks that is tens of thousands of years
+TREE_DEPTH = 40
+SECONDS_PER_YEAR = 365 * 24 * 60 * 60
+# Simulated clock starts here (UTC), so every process agrees on the current tick
+DEFAULT_EPOCH = 1_704_067_200  # 2024-01-01
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finaliser: a cheap, well-distributed hash of uint64 arrays."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _uniforms(h: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Two independent uniforms in (0, 1) from the high and low halves of a 64-bit hash."""
+    scale = 1.0 / 2 ** 32
+    high = ((h >> np.uint64(32)).astype(np.float64) + 0.5) * scale
+    low = ((h & np.uint64(0xFFFFFFFF)).astype(np.float64) + 0.5) * scale
+    return high, low
+
+
+def _normals(keys: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """One standard normal per (key, node) pair, via Box-Muller on a counter-based hash."""
+    u1, u2 = _uniforms(_mix(keys ^ _mix(nodes)))
+    return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+
+class MarketSimulator:
+    """
+    Seeded geometric Brownian motion for any number of symbols, with no state to share.
+
+    Each symbol's Brownian path is built by Lévy's midpoint construction over a binary tree
+    of ticks, where every node's normal draw is a hash of (seed, symbol, node). The price at
+    any tick is therefore a pure function of those three inputs: it costs TREE_DEPTH vectorised
+    steps, is identical in every process, and moves on smoothly as the clock advances.
+    Starting price, volatility and drift are drawn per symbol from the same hash.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        tick_seconds: float = 1.0,
+        epoch: float = DEFAULT_EPOCH,
+        drift: float = 0.05,
+        min_volatility: float = 0.15,
+        max_volatility: float = 0.60,
+        min_price: float = 5.0,
+        max_price: float = 500.0,
+    ):
+        self.seed = seed
+        self.tick_seconds = tick_seconds
+        self.epoch = epoch
+        self.drift = drift
+        self.min_volatility = min_volatility
+        self.max_volatility = max_volatility
+        self.min_price = min_price
+        self.max_price = max_price
+        self._dt = tick_seconds / SECONDS_PER_YEAR
+        self._params: dict[str, tuple[int, float, float]] = {}
+
+    def tick(self, now: float | None = None) -> int:
+        """The simulated tick for a wall-clock time (defaults to now)."""
+        now = time.time() if now is None else now
+        return max(0, int((now - self.epoch) // self.tick_seconds))
+
+    def _symbol_params(self, symbols: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-symbol (hash key, log starting price, volatility), memoised since symbols repeat."""
+        missing = [symbol for symbol in symbols if symbol not in self._params]
+        if missing:
+            keys = np.array(
+                [zlib.crc32(symbol.encode()) | (self.seed & 0xFFFFFFFF) << 32 for symbol in missing],
+                dtype=np.uint64,
+            )
+            keys = _mix(keys)
+            u_price, u_vol = _uniforms(_mix(keys ^ np.uint64(0x5EED)))
+            log_start = np.log(self.min_price) + u_price * np.log(self.max_price / self.min_price)
+            volatility = self.min_volatility + u_vol * (self.max_volatility - self.min_volatility)
+            for symbol, key, start, vol in zip(missing, keys, log_start, volatility):
+                self._params[symbol] = (int(key), float(start), float(vol))
+        params = [self._params[symbol] for symbol in symbols]
+        keys = np.array([key for key, _, _ in params], dtype=np.uint64)
+        log_start = np.array([start for _, start, _ in params])
+        volatility = np.array([vol for _, _, vol in params])
+        return keys, log_start, volatility
+
+    def _brownian(self, keys: np.ndarray, ticks: np.ndarray) -> np.ndarray:
+        """Standard Brownian motion W(tick), in units of ticks, for broadcastable keys and ticks."""
+        keys, ticks = np.broadcast_arrays(keys, ticks.astype(np.uint64))
+        span = float(2 ** TREE_DEPTH)
+        node = np.ones(keys.shape, dtype=np.uint64)
+        left = np.zeros(keys.shape, dtype=np.uint64)
+        w_left = np.zeros(keys.shape)
+        w_right = np.sqrt(span) * _normals(keys, node)
+        width = np.uint64(2 ** TREE_DEPTH)
+        for _ in range(TREE_DEPTH):
+            half = width >> np.uint64(1)
+            mid = left + half
+            w_mid = 0.5 * (w_left + w_right) + np.sqrt(float(half) / 2.0) * _normals(keys, node << np.uint64(1))
+            go_right = ticks >= mid
+            node = (node << np.uint64(1)) + go_right.astype(np.uint64)
+            left = np.where(go_right, mid, left)
+            w_left = np.where(go_right, w_mid, w_left)
+            w_right = np.where(go_right, w_right, w_mid)
+            width = half
+        return w_left
+
+    def prices_at(self, symbols: Iterable[str], tick: int) -> dict[str, float]:
+        """Prices for every symbol at one tick."""
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        path = self.path(symbols, tick, 1)
+        return dict(zip(symbols, path[0].tolist()))
+
+    def path(self, symbols: list[str], start: int, steps: int) -> np.ndarray:
+        """A (steps, len(symbols)) array of prices for consecutive ticks from start."""
+        keys, log_start, volatility = self._symbol_params(symbols)
+        ticks = np.arange(start, start + steps, dtype=np.uint64)[:, None]
+        w = self._brownian(keys[None, :], ticks)
+        t = ticks.astype(np.float64) * self._dt
+        log_price = log_start + (self.drift - 0.5 * volatility ** 2) * t + volatility * np.sqrt(self._dt) * w
+        return np.round(np.exp(log_price), 2)
+
+    def get_prices(self, symbols: Iterable[str], now: float | None = None) -> dict[str, float]:
+        return self.prices_at(symbols, self.tick(now))
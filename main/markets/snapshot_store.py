@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Iterator
+
+# File layout, all little-endian:
+#   header   magic (8 bytes), symbol count (uint32), symbol blob size (uint32)
+#   offsets  count + 1 uint32 offsets into the symbol blob
+#   prices   count float64, padded to an 8-byte boundary
+#   symbols  sorted ASCII symbols, concatenated
+MAGIC = b"EODSNAP1"
+HEADER = struct.Struct("<8sII")
+
+
+def _layout(count: int) -> tuple[int, int, int]:
+    offsets_start = HEADER.size
+    prices_start = offsets_start + 4 * (count + 1)
+    prices_start += -prices_start % 8
+    symbols_start = prices_start + 8 * count
+    return offsets_start, prices_start, symbols_start
+
+
+def write_snapshot(path: str, prices: dict[str, float]) -> None:
+    """Write prices as a sorted, memory-mappable snapshot (atomically replacing any old file)."""
+    # Sorted by encoded bytes, which is the order lookups compare in
+    rows = sorted((symbol.encode("ascii", "replace"), price) for symbol, price in prices.items())
+    encoded = [symbol for symbol, _ in rows]
+    offsets = [0]
+    for symbol in encoded:
+        offsets.append(offsets[-1] + len(symbol))
+    count = len(rows)
+    offsets_start, prices_start, _ = _layout(count)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, count, offsets[-1]))
+        f.write(struct.pack(f"<{count + 1}I", *offsets))
+        f.write(b"\0" * (prices_start - offsets_start - 4 * (count + 1)))
+        f.write(struct.pack(f"<{count}d", *(float(price or 0.0) for _, price in rows)))
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+
+
+class MarketSnapshot(Mapping):
+    """
+    Read-only symbol -> price mapping over a memory-mapped snapshot file.
+
+    Nothing is parsed up front: lookups binary-search the sorted symbols in place, so every
+    process mapping the same file shares one copy of it through the page cache.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count, symbols_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a market snapshot")
+        offsets_start, prices_start, symbols_start = _layout(count)
+        self._count = count
+        self._offsets = view[offsets_start:offsets_start + 4 * (count + 1)].cast("I")
+        self._prices = view[prices_start:symbols_start].cast("d")
+        self._symbols = view[symbols_start:symbols_start + symbols_size]
+
+    def _symbol(self, index: int) -> bytes:
+        return self._symbols[self._offsets[index]:self._offsets[index + 1]].tobytes()
+
+    def _find(self, symbol: str) -> int:
+        key = symbol.encode("ascii", "replace")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._symbol(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._symbol(lo) == key:
+            return lo
+        return -1
+
+    def __getitem__(self, symbol: str) -> float:
+        index = self._find(symbol) if isinstance(symbol, str) else -1
+        if index < 0:
+            raise KeyError(symbol)
+        return self._prices[index]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._symbol(index).decode("ascii")
+
+
+def prune_snapshots(directory: str, prefix: str, keep: int) -> None:
+    """Delete all but the newest `keep` snapshots named <prefix><date>.snap in directory."""
+    # ISO dates sort chronologically by name; processes still mapping a deleted file keep their view
+    names = sorted(name for name in os.listdir(directory) if name.startswith(prefix) and name.endswith(".snap"))
+    for name in names[:max(0, len(names) - keep)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError as e:
+            print(f"Could not remove old market snapshot {name}: {e}")
+
+
+def load_snapshot(path: str) -> MarketSnapshot | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        return MarketSnapshot(path)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable market snapshot {path}: {e}")
+        return None
@@ -7,6 +7,7 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from main.accounts.accounts import Account
+from main.utils.metrics_exporter import start_metrics_exporter
 
 mcp = FastMCP("accounts_server")
 
@@ -74,4 +75,6 @@ async def read_strategy_resource(name: str) -> str:
     return account.get_strategy()
 
 if __name__ == "__main__":
+    # Trades, their price lookups and the account writes to SQLite happen in this process, so it exports its own metrics file
+    start_metrics_exporter("accounts_server")
     mcp.run(transport='stdio')
\ No newline at end of file
@@ -6,7 +6,8 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from main.markets.market import get_share_price
+from main.markets.market import get_share_price, get_share_prices
+from main.utils.metrics_exporter import start_metrics_exporter
 
 mcp = FastMCP("market_server")
 
@@ -19,5 +20,16 @@ async def lookup_share_price(symbol: str) -> float:
     """
     return get_share_price(symbol)
 
+@mcp.tool()
+async def lookup_share_prices(symbols: list[str]) -> dict[str, float]:
+    """This tool provides the current prices of several stock symbols in one call.
+
+    Args:
+        symbols: the symbols of the stocks
+    """
+    return get_share_prices(symbols)
+
 if __name__ == "__main__":
+    # Price lookups and price cache hits and misses are counted in this process, so it exports its own metrics file
+    start_metrics_exporter("market_server")
     mcp.run(transport='stdio')
\ No newline at end of file
@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import json
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, TypeVar
+
+import anyio
+from agents.mcp import MCPServer, MCPServerStdio
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.metrics import registry
+
+# Same session timeout the traders have always used for their MCP servers
+CLIENT_SESSION_TIMEOUT_SECONDS = 120
+# A server that hasn't answered anything for this long is pinged before its next use,
+# and restarted if the ping gets no answer within HEALTH_CHECK_TIMEOUT_SECONDS
+HEALTH_CHECK_INTERVAL_SECONDS = 30
+HEALTH_CHECK_TIMEOUT_SECONDS = 5
+STOP_TIMEOUT_SECONDS = 10
+# What a request raises when the server process or its pipes went away (as opposed to an
+# error the server answered with), so the server is restarted and the request sent again
+TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+T = TypeVar("T")
+
+
+def _server_name(params: dict) -> str:
+    """A short label for logs: the module, package or command the server runs."""
+    args = [arg for arg in params.get("args", []) if not arg.startswith("-")]
+    return args[-1] if args else params["command"]
+
+
+def count_mcp_spawn(params: dict) -> None:
+    registry.counter("mcp_server_starts_total", "MCP server subprocesses launched", server=_server_name(params)).inc()
+
+
+class PooledServer:
+    """
+    One long-lived stdio MCP server.
+
+    The server is connected and cleaned up by a dedicated owner task: the MCP client's
+    anyio task groups must be exited by the task that entered them, which no single trader
+    run can guarantee once the server outlives it. Other tasks just use the session: while
+    it is connected and has answered within HEALTH_CHECK_INTERVAL_SECONDS, get() returns it
+    without a lock or a ping, so concurrent requests are multiplexed on it.
+    """
+
+    def __init__(self, params: dict):
+        self.params = params
+        self.name = _server_name(params)
+        self.server: MCPServerStdio | None = None
+        self.starts = 0
+        # Runs currently holding this server, and when one last let go of it (for idle eviction)
+        self.in_use = 0
+        self.last_used = 0
+        # Loop time of the last ping or request the server answered
+        self._last_ok = float("-inf")
+        self._task: asyncio.Task | None = None
+        self._stop: asyncio.Event | None = None
+        self._lock = asyncio.Lock()
+
+    async def _own(self, ready: asyncio.Future) -> None:
+        server = MCPServerStdio(
+            self.params,
+            name=self.name,
+            cache_tools_list=True,
+            client_session_timeout_seconds=CLIENT_SESSION_TIMEOUT_SECONDS,
+        )
+        try:
+            await server.connect()
+        except Exception as e:
+            ready.set_exception(e)
+            await server.cleanup()
+            return
+        self.server = server
+        ready.set_result(server)
+        try:
+            await self._stop.wait()
+        finally:
+            self.server = None
+            await server.cleanup()
+
+    def _connected(self) -> bool:
+        return self.server is not None and self._task is not None and not self._task.done() and self.server.session is not None
+
+    def _recently_ok(self) -> bool:
+        return asyncio.get_running_loop().time() - self._last_ok < HEALTH_CHECK_INTERVAL_SECONDS
+
+    async def _healthy(self) -> bool:
+        if not self._connected():
+            return False
+        try:
+            await asyncio.wait_for(self.server.session.send_ping(), HEALTH_CHECK_TIMEOUT_SECONDS)
+            self._last_ok = asyncio.get_running_loop().time()
+            return True
+        except Exception as e:
+            print(f"MCP server {self.name} failed its health check ({e!r}); restarting it")
+            return False
+
+    async def _start(self) -> MCPServer:
+        await self.stop()
+        self._stop = asyncio.Event()
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._own(ready), name=f"mcp-{self.name}")
+        self.starts += 1
+        count_mcp_spawn(self.params)
+        await asyncio.wait((ready, self._task), return_when=asyncio.FIRST_COMPLETED)
+        if not ready.done():
+            raise RuntimeError(f"MCP server {self.name} exited before it connected")
+        self._last_ok = asyncio.get_running_loop().time()
+        return ready.result()
+
+    async def get(self) -> MCPServer:
+        """The connected server, (re)started first if it has never run, exited or stopped answering."""
+        if self._connected() and self._recently_ok():
+            return self.server
+        async with self._lock:
+            # Another task may have checked or restarted it while this one waited
+            if self._connected() and self._recently_ok():
+                return self.server
+            if await self._healthy():
+                return self.server
+            return await self._start()
+
+    async def _restart(self, failed: MCPServer) -> MCPServer:
+        async with self._lock:
+            # Concurrent requests that failed on the same server restart it only once
+            if self.server is failed or not self._connected():
+                return await self._start()
+            return self.server
+
+    async def request(self, send: Callable[[MCPServer], Awaitable[T]]) -> T:
+        """send(server) on the connected server; if the connection broke, restart it and send once more."""
+        server = await self.get()
+        try:
+            result = await send(server)
+        except TRANSPORT_ERRORS as e:
+            print(f"MCP server {self.name} connection failed ({e!r}); restarting it and retrying")
+            server = await self._restart(server)
+            result = await send(server)
+        self._last_ok = asyncio.get_running_loop().time()
+        return result
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(task, STOP_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"MCP server {self.name} did not shut down cleanly: {e!r}")
+
+
+class MCPServerPool:
+    """
+    Keeps MCP servers running across trading cycles instead of spawning them per run.
+
+    Servers are keyed by their launch parameters, so identical ones (accounts, market,
+    fetch, ...) are shared by every trader, while servers whose parameters differ per
+    trader, such as each researcher's memory database, stay pinned to that trader.
+    A checkout restarts a server that crashed, or that hung (it is pinged when it has been
+    quiet for HEALTH_CHECK_INTERVAL_SECONDS). With
+    max_idle_servers set, servers no run is using beyond that many are stopped, least
+    recently used first, so a large roster doesn't keep one memory server per trader up.
+    """
+
+    def __init__(self, max_idle_servers: int | None = None):
+        self.max_idle_servers = max_idle_servers
+        self._servers: dict[str, PooledServer] = {}
+        self._uses = itertools.count(1)
+
+    @asynccontextmanager
+    async def checkout(self, params_list: list[dict]):
+        """The connected servers for params_list, held (and safe from eviction) until the block exits."""
+        pooled = []
+        for params in params_list:
+            key = json.dumps(params, sort_keys=True)
+            if key not in self._servers:
+                self._servers[key] = PooledServer(params)
+            pooled.append(self._servers[key])
+        for server in pooled:
+            server.in_use += 1
+        try:
+            yield list(await asyncio.gather(*(server.get() for server in pooled)))
+        finally:
+            for server in pooled:
+                server.in_use -= 1
+                server.last_used = next(self._uses)
+            await self._evict_idle()
+
+    async def _evict_idle(self) -> None:
+        if self.max_idle_servers is None:
+            return
+        idle = sorted(
+            (item for item in self._servers.items() if not item[1].in_use),
+            key=lambda item: item[1].last_used,
+        )
+        evicted = idle[:max(0, len(idle) - self.max_idle_servers)]
+        for key, _ in evicted:
+            del self._servers[key]
+        await asyncio.gather(*(server.stop() for _, server in evicted))
+
+    def stats(self) -> list[tuple[str, int]]:
+        """How many times each server has been started (more than once means restarts)."""
+        return [(server.name, server.starts) for server in self._servers.values()]
+
+    async def close(self) -> None:
+        await asyncio.gather(*(server.stop() for server in self._servers.values()))
+        self._servers.clear()
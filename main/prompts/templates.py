@@ -13,7 +13,7 @@ if is_realtime_polygon:
 elif is_paid_polygon:
     note = "You have access to market data tools but without access to the trade or quote tools; use your get_snapshot_ticker tool to get the latest share price on a 15 min delay. You can also use tools for share information, trends and technical indicators and fundamentals."
 else:
-    note = "You have access to end of day market data; use you get_share_price tool to get the share price as of the prior close."
+    note = "You have access to end of day market data; use you get_share_price tool to get the share price as of the prior close, or lookup_share_prices to price several symbols in one call."
 
 
 def researcher_instructions():
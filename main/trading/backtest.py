@@ -0,0 +1,249 @@
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import Callable, Iterable
+
+import numpy as np
+from pydantic import PrivateAttr
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.accounts.accounts import Account, INITIAL_BALANCE
+from main.markets import market
+from main.markets.history import get_price_history, last_completed_session, trading_days
+from main.markets.providers import PriceProvider
+from main.markets.simulator import MarketSimulator
+from main.utils.database import read_account_transactions
+
+# Orders are (symbol, quantity) or (symbol, quantity, rationale); negative quantities sell
+Order = tuple
+Strategy = Callable[["Backtest", int], Iterable[Order]]
+# Trades are stamped at the close of their simulated day
+CLOSE_TIME = "16:00:00"
+
+
+class PriceHistory:
+    """Daily closes as a (days, symbols) matrix, forward-filled; 0.0 before a symbol's first bar."""
+
+    def __init__(self, dates: list[str], symbols: list[str], closes: np.ndarray):
+        self.dates = dates
+        self.symbols = symbols
+        self.closes = closes
+        self.columns = {symbol: i for i, symbol in enumerate(symbols)}
+
+    @classmethod
+    def from_store(cls, symbols: list[str], start: str, end: str) -> "PriceHistory":
+        """Closes from the local bars table (see main.markets.history for backfilling it)."""
+        series = get_price_history(symbols, start, end)
+        dates = sorted({day for rows in series.values() for day, _ in rows})
+        rows = {day: i for i, day in enumerate(dates)}
+        closes = np.full((len(dates), len(symbols)), np.nan)
+        for column, symbol in enumerate(symbols):
+            for day, close in series.get(symbol, ()):
+                closes[rows[day], column] = close
+        # Forward-fill gaps (halts, late listings) from the previous close in the same column
+        filled = np.where(np.isnan(closes), 0, np.arange(len(dates))[:, None])
+        closes = closes[np.maximum.accumulate(filled, axis=0), np.arange(len(symbols))]
+        return cls(dates, symbols, np.nan_to_num(closes))
+
+    @classmethod
+    def simulated(cls, symbols: list[str], days: int, seed: int = 0, end: date | None = None) -> "PriceHistory":
+        """Synthetic daily closes from the offline market simulator, one tick per trading day."""
+        end = end or last_completed_session()
+        dates = trading_days(end - timedelta(days=days * 2 + 14), end)[-days:]
+        simulator = MarketSimulator(seed=seed, tick_seconds=24 * 60 * 60)
+        closes = simulator.path(symbols, simulator.tick(time.time()) - len(dates), len(dates))
+        return cls([day.isoformat() for day in dates], symbols, closes)
+
+
+class HistoricalPriceProvider(PriceProvider):
+    """Serves the backtest's current day of closes to anything that asks market for a price."""
+
+    name = "historical"
+    instrumented = False
+
+    def __init__(self, backtest: "Backtest"):
+        self.backtest = backtest
+
+    def get_prices(self, symbols: list[str]) -> dict[str, float]:
+        row = self.backtest.prices
+        columns = self.backtest.history.columns
+        return {symbol: float(row[columns[symbol]]) if symbol in columns else 0.0 for symbol in symbols}
+
+
+class BacktestAccount(Account):
+    """An Account that trades on the simulated clock and never touches the database, logs or live metrics."""
+
+    _clock: str = PrivateAttr(default="")
+
+    def _now(self) -> str:
+        return self._clock
+
+    def _log(self, message: str):
+        pass
+
+    def _count_trade(self, symbol: str, side: str):
+        pass
+
+    def save(self):
+        self._dirty = set()
+
+    def _report(self) -> str:
+        # The engine values the whole run at once, so skip the per-trade valuation and JSON dump
+        return json.dumps({"balance": self.balance, "holdings": self.holdings})
+
+
+class BacktestResult:
+    def __init__(self, history: PriceHistory, account: Account, equity: np.ndarray, rejected: list, elapsed: float):
+        self.dates = history.dates
+        self.account = account
+        self.equity = equity
+        self.rejected = rejected
+        self.elapsed = elapsed
+
+    @property
+    def days_per_second(self) -> float:
+        return len(self.dates) / self.elapsed if self.elapsed else float("inf")
+
+    def summary(self) -> dict:
+        peak = np.maximum.accumulate(self.equity)
+        return {
+            "days": len(self.dates),
+            "start": self.dates[0] if self.dates else None,
+            "end": self.dates[-1] if self.dates else None,
+            "final_equity": round(float(self.equity[-1]), 2) if len(self.equity) else None,
+            "total_return": round(float(self.equity[-1] / self.equity[0] - 1), 4) if len(self.equity) else None,
+            "max_drawdown": round(float(np.max(1 - self.equity / peak)), 4) if len(self.equity) else None,
+            "trades": len(self.account.transactions),
+            "rejected": len(self.rejected),
+            "days_per_second": round(self.days_per_second, 1),
+        }
+
+
+class Backtest:
+    """
+    Replays a strategy day by day through Account.buy_shares/sell_shares at historical closes.
+
+    Every order goes through the live account logic (SPREAD, cash and holdings checks) with
+    market prices served from the current day. Sells run before buys each day. Holdings and
+    cash are recorded per day, and the equity curve is valued afterwards with one matrix product.
+    """
+
+    def __init__(self, history: PriceHistory, strategy: Strategy, name: str = "backtest", balance: float = INITIAL_BALANCE):
+        self.history = history
+        self.strategy = strategy
+        self.account = BacktestAccount(
+            name=name,
+            balance=balance,
+            strategy="",
+            holdings={},
+            transactions=[],
+            portfolio_value_time_series=[],
+        )
+        self.day = 0
+        self.prices = history.closes[0] if len(history.dates) else np.zeros(len(history.symbols))
+
+    @property
+    def date(self) -> str:
+        return self.history.dates[self.day]
+
+    def run(self) -> BacktestResult:
+        history, account = self.history, self.account
+        days = len(history.dates)
+        deltas = np.zeros((days, len(history.symbols)), dtype=np.int64)
+        cash = np.zeros(days)
+        rejected = []
+        previous = market.price_provider
+        market.set_price_provider(HistoricalPriceProvider(self))
+        start = time.perf_counter()
+        try:
+            for day in range(days):
+                self.day = day
+                self.prices = history.closes[day]
+                account._clock = f"{self.date} {CLOSE_TIME}"
+                orders = sorted(self.strategy(self, day) or (), key=lambda order: order[1] > 0)
+                for symbol, quantity, *rest in orders:
+                    rationale = rest[0] if rest else ""
+                    try:
+                        if quantity > 0:
+                            account.buy_shares(symbol, quantity, rationale)
+                        elif quantity < 0:
+                            account.sell_shares(symbol, -quantity, rationale)
+                    except ValueError as e:
+                        rejected.append((self.date, symbol, quantity, str(e)))
+                    else:
+                        deltas[day, history.columns[symbol]] += quantity
+                cash[day] = account.balance
+        finally:
+            market.set_price_provider(previous)
+        positions = np.cumsum(deltas, axis=0)
+        equity = cash + np.einsum("ij,ij->i", positions, history.closes)
+        return BacktestResult(history, account, equity, rejected, time.perf_counter() - start)
+
+
+def momentum_strategy(lookback: int = 20, top: int = 10, every: int = 5) -> Strategy:
+    """Every `every` days, hold equal weights of the `top` symbols with the best `lookback`-day return."""
+
+    def strategy(backtest: Backtest, day: int) -> list[Order]:
+        if day < lookback or day % every:
+            return []
+        closes = backtest.history.closes
+        past, now = closes[day - lookback], closes[day]
+        returns = np.where((past > 0) & (now > 0), now / np.where(past > 0, past, 1) - 1, -np.inf)
+        winners = {backtest.history.symbols[i] for i in np.argsort(returns)[::-1][:top] if returns[i] > -np.inf}
+        account = backtest.account
+        columns = backtest.history.columns
+        equity = account.balance + sum(now[columns[s]] * q for s, q in account.holdings.items())
+        target = equity / max(len(winners), 1) * 0.98
+        orders = [(symbol, -quantity, "momentum exit") for symbol, quantity in account.holdings.items() if symbol not in winners]
+        for symbol in winners:
+            wanted = int(target // now[columns[symbol]]) - account.holdings.get(symbol, 0)
+            if wanted:
+                orders.append((symbol, wanted, "momentum rebalance"))
+        return orders
+
+    return strategy
+
+
+def replay_transactions(transactions: list[dict]) -> Strategy:
+    """Re-issue recorded trades (e.g. a trader's transaction log) on the first trading day at or after each one."""
+    pending = sorted(transactions, key=lambda t: t["timestamp"])
+
+    def strategy(backtest: Backtest, day: int) -> list[Order]:
+        orders = []
+        while pending and pending[0]["timestamp"][:10] <= backtest.date:
+            t = pending.pop(0)
+            orders.append((t["symbol"], t["quantity"], t.get("rationale", "")))
+        return orders
+
+    return strategy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest a strategy against daily closes")
+    parser.add_argument("--symbols", nargs="*", help="symbols to trade (default: synthetic universe)")
+    parser.add_argument("--universe", type=int, default=500, help="size of the synthetic universe")
+    parser.add_argument("--days", type=int, default=252, help="trading days to replay")
+    parser.add_argument("--stored", action="store_true", help="use the local bars table instead of simulated closes")
+    parser.add_argument("--replay", help="replay this trader's recorded transactions instead of the momentum strategy")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    replay = read_account_transactions(args.replay) if args.replay else None
+    symbols = args.symbols or (
+        sorted({t["symbol"] for t in replay}) if replay
+        else [f"SIM{i:04d}" for i in range(args.universe)]
+    )
+    if args.stored or replay:
+        end = last_completed_session()
+        history = PriceHistory.from_store(symbols, (end - timedelta(days=args.days * 7 // 5 + 7)).isoformat(), end.isoformat())
+    else:
+        history = PriceHistory.simulated(symbols, args.days, seed=args.seed)
+    strategy = replay_transactions(replay) if replay else momentum_strategy()
+    result = Backtest(history, strategy).run()
+    print(json.dumps(result.summary(), indent=2))
@@ -0,0 +1,135 @@
+import json
+import re
+from dataclasses import dataclass, replace
+from dotenv import load_dotenv
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.prompts.strategies import STRATEGIES
+
+load_dotenv(override=True)
+
+# JSON file defining the traders (see README); the built-in four are used when unset
+TRADERS_FILE = os.getenv("TRADERS_FILE")
+# Grow (by cloning the roster's traders as Warren2, George2, ...) or trim the roster to this many
+TRADER_COUNT = os.getenv("TRADER_COUNT")
+
+# Names become account keys, memory database files and trace id tags (32 chars in all)
+NAME_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9]{0,23}")
+
+
+@dataclass(frozen=True)
+class TraderSpec:
+    name: str
+    lastname: str
+    strategy: str
+    # Model ID for this trader; None means the MODEL environment variable
+    model: str | None = None
+    # Seconds between this trader's runs; None means RUN_EVERY_N_SECONDS
+    interval: float | None = None
+
+
+DEFAULT_ROSTER = [
+    TraderSpec("Warren", "Patience", STRATEGIES["Warren"]),
+    TraderSpec("George", "Bold", STRATEGIES["George"]),
+    TraderSpec("Ray", "Systematic", STRATEGIES["Ray"]),
+    TraderSpec("Cathie", "Crypto", STRATEGIES["Cathie"]),
+]
+LASTNAMES = {spec.name: spec.lastname for spec in DEFAULT_ROSTER}
+
+
+def _renamed_strategy(strategy: str, original: str, name: str) -> str:
+    """A built-in strategy addressed to a different trader ("You are Warren2, ...")."""
+    return strategy.replace(f"You are {original},", f"You are {name},", 1)
+
+
+def spec_from_dict(entry: dict) -> TraderSpec:
+    """
+    Build a trader from one roster entry.
+
+    Args:
+        entry (dict): name, plus either strategy (text) or like (a built-in trader whose
+            strategy and lastname to reuse), and optionally lastname, model and interval
+
+    Returns:
+        TraderSpec: The trader definition
+    """
+    unknown = entry.keys() - {"name", "lastname", "strategy", "like", "model", "interval"}
+    if unknown:
+        raise ValueError(f"Unknown roster fields for {entry.get('name')}: {sorted(unknown)}")
+    name = entry["name"]
+    like = entry.get("like")
+    if like is not None and like not in STRATEGIES:
+        raise ValueError(f"{name}: unknown built-in trader {like!r}; expected one of {list(STRATEGIES)}")
+    strategy = entry.get("strategy") or (_renamed_strategy(STRATEGIES[like], like, name) if like else None)
+    if not strategy:
+        raise ValueError(f"{name}: a roster entry needs a strategy or a built-in trader to be like")
+    interval = entry.get("interval")
+    return TraderSpec(
+        name=name,
+        lastname=entry.get("lastname") or LASTNAMES.get(like, "Trader"),
+        strategy=strategy,
+        model=entry.get("model"),
+        interval=float(interval) if interval is not None else None,
+    )
+
+
+def read_roster_file(path: str) -> list[TraderSpec]:
+    """Traders from a JSON file holding a list of roster entries (or {"traders": [...]})."""
+    with open(path) as f:
+        data = json.load(f)
+    entries = data["traders"] if isinstance(data, dict) else data
+    return [spec_from_dict(entry) for entry in entries]
+
+
+def scale_roster(roster: list[TraderSpec], count: int) -> list[TraderSpec]:
+    """
+    Trim the roster to count traders, or extend it by cloning its traders in turn.
+
+    Clones keep their original's strategy, lastname, model and interval and are numbered
+    from 2 (Warren2, George2, ..., Warren3, ...); names already taken are skipped.
+    """
+    if count <= len(roster):
+        return roster[:count]
+    if not roster:
+        raise ValueError("Cannot scale an empty roster")
+    taken = {spec.name.lower() for spec in roster}
+    scaled = list(roster)
+    copy = 2
+    while len(scaled) < count:
+        for spec in roster:
+            name = f"{spec.name}{copy}"
+            if name.lower() in taken:
+                continue
+            taken.add(name.lower())
+            scaled.append(replace(spec, name=name, strategy=_renamed_strategy(spec.strategy, spec.name, name)))
+            if len(scaled) == count:
+                break
+        copy += 1
+    return scaled
+
+
+def validate_roster(roster: list[TraderSpec]) -> list[TraderSpec]:
+    seen = set()
+    for spec in roster:
+        if not NAME_PATTERN.fullmatch(spec.name):
+            raise ValueError(f"Trader name {spec.name!r} must be a letter then up to 23 letters or digits")
+        # Accounts are stored under the lowercased name
+        if spec.name.lower() in seen:
+            raise ValueError(f"Trader name {spec.name!r} is used more than once (names are case-insensitive)")
+        seen.add(spec.name.lower())
+        if spec.interval is not None and spec.interval <= 0:
+            raise ValueError(f"{spec.name}: interval must be positive, got {spec.interval}")
+    return roster
+
+
+def load_roster(path: str | None = TRADERS_FILE, count: str | int | None = TRADER_COUNT) -> list[TraderSpec]:
+    """The configured traders: TRADERS_FILE (or the built-in four), scaled to TRADER_COUNT if set."""
+    roster = read_roster_file(path) if path else list(DEFAULT_ROSTER)
+    if count not in (None, ""):
+        roster = scale_roster(roster, int(count))
+    return validate_roster(roster)
@@ -0,0 +1,175 @@
+import asyncio
+import math
+import random
+from typing import Awaitable, Callable
+
+import os
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.metrics import registry
+
+# What to do when a job is due again while its previous run is still going
+SKIP = "skip"          # drop the tick
+COALESCE = "coalesce"  # run once more as soon as the current run ends, however many ticks were missed
+OVERRUN_POLICIES = (SKIP, COALESCE)
+
+
+class ScheduledJob:
+    def __init__(self, name: str, run: Callable[[], Awaitable[None]], interval: float, phase: float | None = None):
+        self.name = name
+        self.run = run
+        self.interval = interval
+        # Without an explicit phase the scheduler spreads the job over its interval
+        self.explicit_phase = phase is not None
+        self.phase = phase or 0.0
+        self.anchor = 0.0
+        self.next_due = 0.0
+        self.task: asyncio.Task | None = None
+        self.pending = False
+        self.runs = 0
+        self.overruns = 0
+
+    def align(self, now: float) -> None:
+        """Restart the job's tick grid at now + phase (at start, and after a pause)."""
+        self.anchor = now + self.phase
+        self.next_due = self.anchor
+
+    def advance(self, now: float) -> None:
+        """Move to the first grid tick after now, so ticks missed while late are not replayed."""
+        ticks = math.floor((now - self.anchor) / self.interval) + 1
+        self.next_due = self.anchor + max(ticks, 1) * self.interval
+
+
+class TradingScheduler:
+    """
+    Runs each trader on its own interval instead of all of them at once.
+
+    Jobs are spread over their interval by phase offsets (evenly, unless given), each start
+    gets up to `jitter` seconds of random delay, and at most `max_concurrency` runs execute
+    at a time. A job that is due while still running is skipped or coalesced, never stacked.
+    `paused_for()` returning a positive number (e.g. seconds until the market opens) skips
+    all ticks until then; the jobs' phases are re-applied when it returns to 0.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        jitter: float = 0.0,
+        overrun_policy: str = SKIP,
+        paused_for: Callable[[], float] | None = None,
+    ):
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy {overrun_policy!r}; expected one of {OVERRUN_POLICIES}")
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.overrun_policy = overrun_policy
+        self.paused_for = paused_for
+        self.jobs: list[ScheduledJob] = []
+
+    def add(self, name: str, run: Callable[[], Awaitable[None]], interval: float, phase: float | None = None) -> ScheduledJob:
+        if interval <= 0:
+            raise ValueError(f"Interval for {name} must be positive, got {interval}")
+        job = ScheduledJob(name, run, interval, phase)
+        self.jobs.append(job)
+        return job
+
+    def _spread_phases(self) -> None:
+        spread = [job for job in self.jobs if not job.explicit_phase]
+        for i, job in enumerate(spread):
+            job.phase = job.interval * i / len(spread)
+
+    def _count(self, outcome: str, job: ScheduledJob) -> None:
+        registry.counter("trading_cycles_total", "Scheduled trader runs by outcome", outcome=outcome, trader=job.name).inc()
+
+    def _fire(self, job: ScheduledJob, now: float) -> None:
+        due = job.next_due
+        job.advance(now)
+        if job.task and not job.task.done():
+            job.overruns += 1
+            if self.overrun_policy == COALESCE:
+                job.pending = True
+                self._count("coalesced", job)
+            else:
+                self._count("skipped", job)
+            action = "running it again when done" if self.overrun_policy == COALESCE else "skipping this tick"
+            print(f"{job.name} is still running from its last tick; {action}")
+            return
+        job.task = asyncio.create_task(self._run_job(job, due), name=f"trader-{job.name}")
+
+    async def _run_job(self, job: ScheduledJob, due: float) -> None:
+        loop = asyncio.get_running_loop()
+        if self.jitter:
+            await asyncio.sleep(random.uniform(0, self.jitter))
+        while True:
+            async with self._semaphore:
+                # Stop may have been pressed while this run waited for jitter or a free slot
+                if self._stopping:
+                    return
+                registry.histogram(
+                    "scheduler_start_delay_seconds", "How late runs start after their tick (jitter and queueing)"
+                ).observe(max(0.0, loop.time() - due))
+                self._running += 1
+                registry.gauge("scheduler_running_jobs", "Trader runs executing right now").set(self._running)
+                try:
+                    await job.run()
+                    job.runs += 1
+                    self._count("run", job)
+                except Exception as e:
+                    print(f"Scheduled run of {job.name} failed: {e}")
+                finally:
+                    self._running -= 1
+                    registry.gauge("scheduler_running_jobs", "Trader runs executing right now").set(self._running)
+            if not job.pending or self._stopping:
+                return
+            job.pending = False
+            due = loop.time()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Run jobs until stop is set, then let in-flight runs finish without starting more (they are cancelled if this is)."""
+        loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._running = 0
+        self._stopping = False
+        self._spread_phases()
+        for job in self.jobs:
+            job.align(loop.time())
+        try:
+            while not stop.is_set() and self.jobs:
+                pause = self.paused_for() if self.paused_for else 0.0
+                if pause > 0:
+                    for job in self.jobs:
+                        self._count("market_closed", job)
+                    print(f"Market is closed, skipping runs; next check in {pause / 3600:.1f} hours")
+                    if await self._wait(stop, pause):
+                        break
+                    for job in self.jobs:
+                        job.align(loop.time())
+                    continue
+                now = loop.time()
+                for job in self.jobs:
+                    if job.next_due <= now:
+                        self._fire(job, now)
+                await self._wait(stop, min(job.next_due for job in self.jobs) - loop.time())
+            # Runs already executing finish, but nothing new starts: no coalesced reruns, no queued starts
+            self._stopping = True
+            for job in self.jobs:
+                job.pending = False
+            tasks = [job.task for job in self.jobs if job.task and not job.task.done()]
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except asyncio.CancelledError:
+            for job in self.jobs:
+                if job.task and not job.task.done():
+                    job.task.cancel()
+            raise
+
+    async def _wait(self, stop: asyncio.Event, seconds: float) -> bool:
+        """Sleep up to seconds; True if stop was set meanwhile."""
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0.0, seconds))
+            return True
+        except asyncio.TimeoutError:
+            return False
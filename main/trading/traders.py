@@ -1,4 +1,5 @@
 from contextlib import AsyncExitStack
+import time
 from typing import Union
 
 from agents import Agent, Model, Tool, Runner, trace
@@ -22,7 +23,9 @@ from main.prompts.templates import (
     research_tool,
 )
 from main.mcp_servers.mcp_params import trader_mcp_server_params, researcher_mcp_server_params
+from main.mcp_servers.server_pool import MCPServerPool, count_mcp_spawn
 from main.utils.model_client import create_agent_model
+from main.utils.metrics import registry
 
 load_dotenv(override=True)
 
@@ -60,12 +63,15 @@ class Trader:
         name: str,
         lastname: str = "Trader",
         model_name: AgentModel | None = None,
+        server_pool: MCPServerPool | None = None,
     ):
         self.name = name
         self.lastname = lastname
         self.agent = None
         self.model_name = model_name or create_agent_model()
         self.do_trade = True
+        # Long-lived MCP servers shared across cycles; without one, servers are spawned per run
+        self.server_pool = server_pool
 
     async def create_agent(self, trader_mcp_servers, researcher_mcp_servers) -> Agent:
         tool = await get_researcher_tool(researcher_mcp_servers, self.model_name)
@@ -96,10 +102,16 @@ class Trader:
         await Runner.run(self.agent, message, max_turns=MAX_TURNS)
 
     async def run_with_mcp_servers(self):
+        if self.server_pool:
+            trader_params = trader_mcp_server_params
+            async with self.server_pool.checkout(trader_params + researcher_mcp_server_params(self.name)) as servers:
+                await self.run_agent(servers[:len(trader_params)], servers[len(trader_params):])
+            return
         async with AsyncExitStack() as stack:
             trader_mcp_servers = []
             for params in trader_mcp_server_params:
                 # print("DEBUG MCP PARAMS:", params)
+                count_mcp_spawn(params)
                 trader_mcp_servers.append(
                     await stack.enter_async_context(
                         MCPServerStdio(params, client_session_timeout_seconds=120)
@@ -109,6 +121,7 @@ class Trader:
                 researcher_mcp_servers = []
                 for params in researcher_mcp_server_params(self.name):
                     # print("DEBUG MCP PARAMS:", params)
+                    count_mcp_spawn(params)
                     researcher_mcp_servers.append(
                         await stack.enter_async_context(
                             MCPServerStdio(params, client_session_timeout_seconds=120)
@@ -123,8 +136,13 @@ class Trader:
             await self.run_with_mcp_servers()
 
     async def run(self):
+        started = time.perf_counter()
         try:
             await self.run_with_trace()
         except Exception as e:
+            registry.counter("trader_run_errors_total", "Trader runs that raised", trader=self.name.lower()).inc()
             print(f"Error running trader {self.name}: {e}")
+        registry.histogram(
+            "trader_run_duration_seconds", "Wall time of one trader's run, MCP setup included", trader=self.name.lower()
+        ).observe(time.perf_counter() - started)
         self.do_trade = not self.do_trade
@@ -1,5 +1,7 @@
 from typing import List
+import argparse
 import asyncio
+import math
 from agents import add_trace_processor
 from dotenv import load_dotenv
 
@@ -11,28 +13,37 @@ if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
 from main.trading.traders import Trader
-from main.utils.tracers import LogTracer
-from main.markets.market import is_market_open
+from main.trading.scheduler import TradingScheduler
+from main.trading.roster import TraderSpec, load_roster
+from main.trading.workers import WorkerSupervisor, handle_stop_signals, shard
+from main.mcp_servers.server_pool import MCPServerPool
+from main.accounts.accounts_client import close_accounts_client
+from main.utils.tracers import LogTracer, MetricsTracer
+from main.utils.metrics_exporter import start_metrics_exporter
+from main.markets.market import is_market_open, seconds_until_market_open
 import main.utils.constants as constants
-from main.utils.model_client import configured_model_display_names, configured_model_names
+from main.utils.model_client import create_agent_model
 
 load_dotenv(override=True)
 
 RUN_EVERY_N_SECONDS = constants.RUN_EVERY_N_SECONDS
 RUN_EVEN_WHEN_MARKET_IS_CLOSED = constants.RUN_EVEN_WHEN_MARKET_IS_CLOSED
+KEEP_MCP_SERVERS_RUNNING = constants.KEEP_MCP_SERVERS_RUNNING
+MAX_CONCURRENT_TRADERS = constants.MAX_CONCURRENT_TRADERS
+SCHEDULER_JITTER_SECONDS = constants.SCHEDULER_JITTER_SECONDS
+SCHEDULER_OVERRUN_POLICY = constants.SCHEDULER_OVERRUN_POLICY
+WORKER_PROCESSES = constants.WORKER_PROCESSES
+MCP_POOL_MAX_IDLE_SERVERS = constants.MCP_POOL_MAX_IDLE_SERVERS
 
-names = ["Warren", "George", "Ray", "Cathie"]
-lastnames = ["Patience", "Bold", "Systematic", "Crypto"]
+# Who trades: TRADERS_FILE / TRADER_COUNT, or the built-in four (main/trading/roster.py)
+roster = load_roster()
 
-model_names = configured_model_names()
-short_model_names = configured_model_display_names()
 
-
-def create_traders() -> List[Trader]:
-    traders = []
-    for name, lastname, model_name in zip(names, lastnames, model_names):
-        traders.append(Trader(name, lastname, model_name))
-    return traders
+def create_traders(server_pool: MCPServerPool | None = None, specs: List[TraderSpec] | None = None) -> List[Trader]:
+    return [
+        Trader(spec.name, spec.lastname, create_agent_model(spec.model), server_pool=server_pool)
+        for spec in (roster if specs is None else specs)
+    ]
 
 # Cooperative cancellation for external controllers (e.g., Gradio UI)
 STOP_EVENT: asyncio.Event = asyncio.Event()
@@ -50,25 +61,100 @@ def reset_stop() -> None:
         globals()["STOP_EVENT"] = asyncio.Event()
 
 
+_tracers_registered = False
+
+def register_tracers() -> None:
+    """Install the log and metrics trace processors once per process, however many runs start."""
+    global _tracers_registered
+    if not _tracers_registered:
+        add_trace_processor(LogTracer())
+        add_trace_processor(MetricsTracer())
+        _tracers_registered = True
+
+
+def seconds_until_trading() -> float:
+    """0 while traders may run, else how long to sleep (straight through to the next open)."""
+    if RUN_EVEN_WHEN_MARKET_IS_CLOSED or is_market_open():
+        return 0.0
+    return max(RUN_EVERY_N_SECONDS, seconds_until_market_open())
+
+
+def create_scheduler(
+    traders: List[Trader], specs: List[TraderSpec] | None = None, max_concurrency: int = MAX_CONCURRENT_TRADERS
+) -> TradingScheduler:
+    """Each trader on its own interval, staggered across it, with at most max_concurrency running."""
+    scheduler = TradingScheduler(
+        max_concurrency=max_concurrency,
+        jitter=SCHEDULER_JITTER_SECONDS,
+        overrun_policy=SCHEDULER_OVERRUN_POLICY,
+        paused_for=seconds_until_trading,
+    )
+    for spec, trader in zip(roster if specs is None else specs, traders):
+        scheduler.add(trader.name, trader.run, spec.interval or RUN_EVERY_N_SECONDS)
+    return scheduler
+
+
+async def run_traders(specs: List[TraderSpec], stop: asyncio.Event, max_concurrency: int = MAX_CONCURRENT_TRADERS):
+    """Schedule these traders in this process until stop is set, then wait for in-flight runs."""
+    # MCP servers stay up for the whole run, shared between traders where their params match
+    server_pool = MCPServerPool(max_idle_servers=MCP_POOL_MAX_IDLE_SERVERS) if KEEP_MCP_SERVERS_RUNNING else None
+    traders = create_traders(server_pool, specs)
+    try:
+        await create_scheduler(traders, specs, max_concurrency).run(stop)
+    finally:
+        if server_pool:
+            await server_pool.close()
+        await close_accounts_client()
+
+
+def worker_commands(workers: int) -> dict[str, list[str]]:
+    """One trading_floor worker per shard of the roster, splitting MAX_CONCURRENT_TRADERS between them."""
+    workers = min(workers, len(roster))
+    max_concurrency = math.ceil(MAX_CONCURRENT_TRADERS / workers)
+    return {
+        f"worker-{index}": [
+            sys.executable, "-m", "main.trading.trading_floor",
+            "--shard", str(index), "--shards", str(workers),
+            "--max-concurrency", str(max_concurrency),
+            "--parent-pid", str(os.getpid()),
+        ]
+        for index in range(workers)
+    }
+
+
 async def run_every_n_minutes():
-    add_trace_processor(LogTracer())
-    traders = create_traders()
+    register_tracers()
+    start_metrics_exporter("trading_floor", serve_http=True)
     try:
-        while not STOP_EVENT.is_set():
-            if RUN_EVEN_WHEN_MARKET_IS_CLOSED or is_market_open():
-                await asyncio.gather(*[trader.run() for trader in traders])
-            else:
-                print("Market is closed, skipping run")
-            # Wait either until next tick or until stop requested
-            try:
-                await asyncio.wait_for(STOP_EVENT.wait(), timeout=RUN_EVERY_N_SECONDS)
-            except asyncio.TimeoutError:
-                # timeout means continue next cycle
-                pass
+        if WORKER_PROCESSES > 1 and len(roster) > 1:
+            # Traders are split across worker processes; this process only supervises them
+            await WorkerSupervisor(worker_commands(WORKER_PROCESSES)).run(STOP_EVENT)
+        else:
+            # Runs until STOP_EVENT is set, then waits for in-flight trader runs to finish
+            await run_traders(roster, STOP_EVENT)
     finally:
         return
 
 
+async def run_worker(index: int, count: int, max_concurrency: int, parent_pid: int | None):
+    """A worker process: this shard of the roster, until SIGTERM or its supervisor exits."""
+    register_tracers()
+    start_metrics_exporter(f"trading_worker_{index}")
+    specs = shard(roster, index, count)
+    handle_stop_signals(STOP_EVENT, parent_pid)
+    print(f"Worker {index + 1}/{count} running {len(specs)} traders: {', '.join(spec.name for spec in specs)}")
+    await run_traders(specs, STOP_EVENT, max_concurrency)
+
+
 if __name__ == "__main__":
-    print(f"Starting scheduler to run every {RUN_EVERY_N_SECONDS} seconds")
-    asyncio.run(run_every_n_minutes())
+    parser = argparse.ArgumentParser(description="Run the trading floor, or one worker's shard of it")
+    parser.add_argument("--shard", type=int, help="run only this shard of the roster (worker mode)")
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENT_TRADERS)
+    parser.add_argument("--parent-pid", type=int, help="stop when this process exits")
+    args = parser.parse_args()
+    if args.shard is not None:
+        asyncio.run(run_worker(args.shard, args.shards, args.max_concurrency, args.parent_pid))
+    else:
+        print(f"Starting scheduler for {len(roster)} traders, each every {RUN_EVERY_N_SECONDS} seconds unless configured otherwise")
+        asyncio.run(run_every_n_minutes())
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import signal
+import sys
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.metrics import registry
+
+# A worker that exits on its own is restarted after this, doubling up to the max while it keeps failing
+RESTART_BACKOFF_SECONDS = 1.0
+MAX_RESTART_BACKOFF_SECONDS = 60.0
+# Running this long counts as healthy again, resetting the backoff
+STABLE_AFTER_SECONDS = 60.0
+# How long a stopped worker gets to finish its in-flight trader runs before it is killed
+WORKER_STOP_TIMEOUT_SECONDS = 120.0
+# How often a worker checks that its supervisor is still alive
+PARENT_CHECK_SECONDS = 5.0
+
+
+def shard(items: list, index: int, count: int) -> list:
+    """Every count-th item starting at index, so shards differ in size by at most one."""
+    return items[index::count]
+
+
+class WorkerSupervisor:
+    """
+    Runs worker subprocesses until stop is set, restarting any that exit early.
+
+    Stopping sends each worker SIGTERM so it can finish in-flight work, and kills the ones
+    still running after stop_timeout. If the supervisor itself is cancelled, workers are
+    sent SIGTERM and left to wind down on their own.
+    """
+
+    def __init__(self, commands: dict[str, list[str]], stop_timeout: float = WORKER_STOP_TIMEOUT_SECONDS):
+        self.commands = commands
+        self.stop_timeout = stop_timeout
+        self.processes: dict[str, asyncio.subprocess.Process] = {}
+
+    async def run(self, stop: asyncio.Event) -> None:
+        tasks = [asyncio.create_task(self._keep_running(name, stop)) for name in self.commands]
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            for process in self.processes.values():
+                if process.returncode is None:
+                    process.terminate()
+            raise
+
+    async def _keep_running(self, name: str, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        backoff = RESTART_BACKOFF_SECONDS
+        while not stop.is_set():
+            started = loop.time()
+            process = await asyncio.create_subprocess_exec(*self.commands[name], cwd=root_dir)
+            self.processes[name] = process
+            registry.gauge("worker_processes_running", "Trading worker processes alive", worker=name).set(1)
+            exited = asyncio.create_task(process.wait())
+            stopping = asyncio.create_task(stop.wait())
+            try:
+                await asyncio.wait((exited, stopping), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                stopping.cancel()
+            if not exited.done():
+                await self._terminate(name, process)
+                registry.gauge("worker_processes_running", "Trading worker processes alive", worker=name).set(0)
+                return
+            registry.gauge("worker_processes_running", "Trading worker processes alive", worker=name).set(0)
+            registry.counter("worker_restarts_total", "Trading workers restarted after exiting", worker=name).inc()
+            if loop.time() - started >= STABLE_AFTER_SECONDS:
+                backoff = RESTART_BACKOFF_SECONDS
+            print(f"Worker {name} exited with code {process.returncode}; restarting in {backoff:g}s")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=backoff)
+                return
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, MAX_RESTART_BACKOFF_SECONDS)
+
+    async def _terminate(self, name: str, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.stop_timeout)
+        except asyncio.TimeoutError:
+            print(f"Worker {name} did not stop within {self.stop_timeout:.0f}s; killing it")
+            process.kill()
+            await process.wait()
+
+
+def handle_stop_signals(stop: asyncio.Event, parent_pid: int | None = None) -> asyncio.Task | None:
+    """
+    In a worker: set stop on SIGTERM/SIGINT, and when the supervisor (parent_pid) goes away.
+
+    Returns:
+        The task watching the parent, if one was started
+    """
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            # Windows event loops don't support signal handlers; terminate() ends the process there
+            pass
+    if not parent_pid:
+        return None
+
+    async def watch_parent():
+        while not stop.is_set():
+            if os.getppid() != parent_pid:
+                print("Supervisor went away; stopping this worker")
+                stop.set()
+                return
+            await asyncio.sleep(PARENT_CHECK_SECONDS)
+
+    return asyncio.create_task(watch_parent())
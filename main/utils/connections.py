@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Defaults tuned for a small, write-heavy, multi-process workload (traders, MCP servers, UI)
+BUSY_TIMEOUT_SECONDS = 30.0
+CACHE_SIZE_KIB = 16 * 1024
+CACHED_STATEMENTS = 256
+
+
+class ConnectionPool:
+    """
+    Hand out one long-lived SQLite connection per thread and per process.
+
+    Connections are opened lazily, switched to WAL journaling and kept open so that
+    sqlite3's per-connection statement cache can reuse prepared statements across calls.
+    A forked child never reuses its parent's connections; it opens its own on first use.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        read_only: bool = False,
+        busy_timeout: float = BUSY_TIMEOUT_SECONDS,
+        cache_size_kib: int = CACHE_SIZE_KIB,
+        cached_statements: int = CACHED_STATEMENTS,
+    ):
+        self.path = path
+        self.read_only = read_only
+        self.busy_timeout = busy_timeout
+        self.cache_size_kib = cache_size_kib
+        self.cached_statements = cached_statements
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            conn = sqlite3.connect(
+                f"file:{self.path}?mode=ro",
+                uri=True,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            conn.execute("PRAGMA query_only=ON")
+        else:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.cache_size_kib}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        if os.getpid() != self._pid:
+            # Inherited across fork: the parent still owns those handles, so just forget them
+            with self._lock:
+                if os.getpid() != self._pid:
+                    self._reset()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self, write: bool = True):
+        """
+        Run the enclosed statements in a single transaction on this thread's connection.
+
+        Write transactions take the write lock up front (BEGIN IMMEDIATE) so they never fail
+        half-way on a lock upgrade; pass write=False for a consistent multi-statement read.
+        Nested blocks join the outermost transaction, which commits once on exit
+        (or rolls back if an exception escapes).
+        """
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+        conn.execute("BEGIN IMMEDIATE" if write and not self.read_only else "BEGIN")
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def close(self) -> None:
+        """Close every connection this process opened."""
+        with self._lock:
+            if os.getpid() == self._pid:
+                for conn in self._connections:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+            self._reset()
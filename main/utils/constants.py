@@ -1,2 +1,17 @@
 RUN_EVERY_N_SECONDS = 60
 RUN_EVEN_WHEN_MARKET_IS_CLOSED = True
+KEEP_MCP_SERVERS_RUNNING = True
+# Trader runs allowed at once; the rest wait their turn
+MAX_CONCURRENT_TRADERS = 4
+# Random delay (seconds) added to each trader's start so runs don't line up exactly
+SCHEDULER_JITTER_SECONDS = 5
+# When a trader is due while its last run is still going: "skip" the tick or "coalesce" into one rerun
+SCHEDULER_OVERRUN_POLICY = "skip"
+# Split the roster across this many worker processes (0 or 1 runs every trader in the floor's own
+# process); MAX_CONCURRENT_TRADERS is divided between them
+WORKER_PROCESSES = 0
+# Pooled MCP servers that no run is using are stopped, least recently used first, beyond this many
+# (per-trader servers such as researcher memory would otherwise stay up for every trader)
+MCP_POOL_MAX_IDLE_SERVERS = 32
+# Trader columns per dashboard page
+DASHBOARD_PAGE_SIZE = 4
@@ -1,9 +1,19 @@
-import sqlite3
 import os
 import json
-from datetime import datetime
+import time
+import atexit
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.connections import ConnectionPool
+from main.utils.log_writer import LogWriter
+from main.utils.metrics import registry, timed
+
 load_dotenv(override=True)
 
 # Compute persistent DB location under main/memory/
@@ -17,8 +27,11 @@ OLD_DB_PATHS = [
     os.path.join(PROJECT_ROOT, "accounts.db"),
 ]
 
+# Point at a separate database (e.g. for soak tests and benchmarks); the default is migrated below
+ACCOUNTS_DB = os.getenv("ACCOUNTS_DB")
+
 # Migrate legacy DB files if present
-if not os.path.exists(NEW_DB_PATH):
+if not ACCOUNTS_DB and not os.path.exists(NEW_DB_PATH):
     for old_path in OLD_DB_PATHS:
         if os.path.exists(old_path):
             try:
@@ -28,12 +41,158 @@ if not os.path.exists(NEW_DB_PATH):
                 # Best-effort move; fall back to creating a new DB
                 pass
 
-DB = NEW_DB_PATH
+DB = ACCOUNTS_DB or NEW_DB_PATH
+
+# Every function below shares this pool: one WAL-mode connection per thread, per process
+pool = ConnectionPool(DB)
+# The dashboard's queries get their own read-only connections (mode=ro, query_only), so UI
+# load can never write, or hold the write lock the trading processes need
+read_pool = ConnectionPool(DB, read_only=True)
+
+def _timed(operation: str):
+    return timed("db_operation_duration_seconds", "SQLite operation wall time", operation=operation)
+
+ACCOUNT_SCHEMA = [
+    '''
+        CREATE TABLE IF NOT EXISTS accounts (
+            name TEXT PRIMARY KEY,
+            balance REAL NOT NULL,
+            strategy TEXT NOT NULL DEFAULT '',
+            revision INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS holdings (
+            name TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (name, symbol)
+        ) WITHOUT ROWID
+    ''',
+    '''
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            price REAL NOT NULL,
+            timestamp TEXT NOT NULL,
+            rationale TEXT NOT NULL DEFAULT ''
+        )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_transactions_name_id ON transactions (name, id)',
+    '''
+        CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            datetime TEXT NOT NULL,
+            value REAL NOT NULL
+        )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_portfolio_snapshots_name_id ON portfolio_snapshots (name, id)',
+    '''
+        CREATE TABLE IF NOT EXISTS portfolio_rollups (
+            name TEXT NOT NULL,
+            resolution TEXT NOT NULL,
+            bucket TEXT NOT NULL,
+            open REAL NOT NULL,
+            high REAL NOT NULL,
+            low REAL NOT NULL,
+            close REAL NOT NULL,
+            PRIMARY KEY (name, resolution, bucket)
+        ) WITHOUT ROWID
+    ''',
+]
+
+# Portfolio value history is tiered: raw points for recent activity, then minute, hour and
+# day OHLC rollups. Each entry is (resolution, bucket seconds, how long the tier keeps rows).
+PORTFOLIO_TIERS = [
+    ("raw", 0, timedelta(hours=6)),
+    ("minute", 60, timedelta(days=7)),
+    ("hour", 3600, timedelta(days=90)),
+    ("day", 86400, None),
+]
+# Most recent raw points loaded into Account.portfolio_value_time_series
+PORTFOLIO_RECENT_POINTS = 500
+PORTFOLIO_CHART_POINTS = 300
+PORTFOLIO_COMPACT_EVERY_SECONDS = 300
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Log retention: rows older than LOG_RETENTION_DAYS, and all but each name's newest
+# LOG_MAX_ROWS_PER_NAME rows, are deleted every LOG_COMPACT_EVERY_SECONDS (0 disables either)
+LOG_RETENTION_DAYS = float(os.getenv("LOG_RETENTION_DAYS", "30"))
+LOG_MAX_ROWS_PER_NAME = int(os.getenv("LOG_MAX_ROWS_PER_NAME", "50000"))
+LOG_COMPACT_EVERY_SECONDS = 600
+# Rows deleted per transaction, so compaction never holds the write lock for long
+LOG_DELETE_BATCH = 5000
+
+def _migrate_account_blobs(conn):
+    """
+    Move accounts stored as one JSON blob per row (the original schema) into the
+    normalized tables. The old table is kept as accounts_legacy.
+    """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(accounts)')]
+    if 'account' not in columns:
+        return
+    conn.execute('ALTER TABLE accounts RENAME TO accounts_legacy')
+    for statement in ACCOUNT_SCHEMA:
+        conn.execute(statement)
+    for name, blob in conn.execute('SELECT name, account FROM accounts_legacy').fetchall():
+        _replace_account(conn, name, json.loads(blob))
+
+def _add_account_revisions(conn):
+    """ Accounts stored before revisions were counted start at revision 0. """
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(accounts)')]
+    if 'revision' not in columns:
+        conn.execute('ALTER TABLE accounts ADD COLUMN revision INTEGER NOT NULL DEFAULT 0')
+
+def _replace_account(conn, name, account_dict):
+    name = name.lower()
+    conn.execute('''
+        INSERT INTO accounts (name, balance, strategy)
+        VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET balance=excluded.balance, strategy=excluded.strategy, revision=revision + 1
+    ''', (name, account_dict["balance"], account_dict["strategy"]))
+    conn.execute('DELETE FROM holdings WHERE name = ?', (name,))
+    conn.execute('DELETE FROM transactions WHERE name = ?', (name,))
+    conn.execute('DELETE FROM portfolio_snapshots WHERE name = ?', (name,))
+    conn.execute('DELETE FROM portfolio_rollups WHERE name = ?', (name,))
+    _upsert_holdings(conn, name, account_dict["holdings"])
+    _insert_transactions(conn, name, account_dict["transactions"])
+    _insert_portfolio_snapshots(conn, name, account_dict["portfolio_value_time_series"])
+
+def _upsert_holdings(conn, name, holdings):
+    conn.executemany('DELETE FROM holdings WHERE name = ? AND symbol = ?', [
+        (name, symbol) for symbol, quantity in holdings.items() if not quantity
+    ])
+    conn.executemany('''
+        INSERT INTO holdings (name, symbol, quantity)
+        VALUES (?, ?, ?)
+        ON CONFLICT(name, symbol) DO UPDATE SET quantity=excluded.quantity
+    ''', [(name, symbol, quantity) for symbol, quantity in holdings.items() if quantity])
+
+def _insert_transactions(conn, name, transactions):
+    conn.executemany('''
+        INSERT INTO transactions (name, symbol, quantity, price, timestamp, rationale)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', [
+        (name, t["symbol"], t["quantity"], t["price"], t["timestamp"], t["rationale"])
+        for t in transactions
+    ])
+
+def _insert_portfolio_snapshots(conn, name, points):
+    conn.executemany(
+        'INSERT INTO portfolio_snapshots (name, datetime, value) VALUES (?, ?, ?)',
+        [(name, timestamp, value) for timestamp, value in points],
+    )
 
-with sqlite3.connect(DB) as conn:
-    cursor = conn.cursor()
-    cursor.execute('CREATE TABLE IF NOT EXISTS accounts (name TEXT PRIMARY KEY, account TEXT)')
-    cursor.execute('''
+with pool.transaction() as conn:
+    # Runs inside BEGIN IMMEDIATE, so concurrent processes migrate at most once
+    _migrate_account_blobs(conn)
+    for statement in ACCOUNT_SCHEMA:
+        conn.execute(statement)
+    _add_account_revisions(conn)
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS logs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT,
@@ -42,46 +201,476 @@ with sqlite3.connect(DB) as conn:
             message TEXT
         )
     ''')
-    cursor.execute('CREATE TABLE IF NOT EXISTS market (date TEXT PRIMARY KEY, data TEXT)')
-    conn.commit()
+    # A trader's logs are one index range in id order; ids, unlike the one-second datetimes, are unambiguous
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_logs_name_id ON logs (name, id)')
+    # When shared housekeeping (e.g. log retention) last ran, so only one process does each round
+    conn.execute('CREATE TABLE IF NOT EXISTS maintenance (task TEXT PRIMARY KEY, last_run REAL NOT NULL)')
+    conn.execute('CREATE TABLE IF NOT EXISTS prices (symbol TEXT PRIMARY KEY, price REAL NOT NULL, fetched_at REAL NOT NULL)')
+    # Daily OHLCV history, clustered by symbol so a symbol's date range is one contiguous scan
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS bars (
+            symbol TEXT NOT NULL,
+            date TEXT NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL NOT NULL,
+            volume REAL,
+            PRIMARY KEY (symbol, date)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_bars_date ON bars (date)')
 
+@_timed("write_account")
 def write_account(name, account_dict):
-    json_data = json.dumps(account_dict)
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO accounts (name, account)
-            VALUES (?, ?)
-            ON CONFLICT(name) DO UPDATE SET account=excluded.account
-        ''', (name.lower(), json_data))
-        conn.commit()
+    """Replace everything stored for an account with the given (model_dump) dict."""
+    with pool.transaction() as conn:
+        _replace_account(conn, name, account_dict)
+
+@_timed("update_account")
+def update_account(name, balance, strategy, holdings=None, transactions=(), portfolio_points=()):
+    """
+    Incrementally persist an account in one transaction.
+
+    Args:
+        name (str): The account name
+        balance (float): The current cash balance
+        strategy (str): The current strategy
+        holdings (dict): Only the symbols whose quantity changed; 0 removes the holding
+        transactions (list): Transaction dicts that are not stored yet
+        portfolio_points (list): (datetime, value) pairs that are not stored yet
+    """
+    name = name.lower()
+    with pool.transaction() as conn:
+        conn.execute('''
+            INSERT INTO accounts (name, balance, strategy)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET balance=excluded.balance, strategy=excluded.strategy, revision=revision + 1
+        ''', (name, balance, strategy))
+        if holdings:
+            _upsert_holdings(conn, name, holdings)
+        if transactions:
+            _insert_transactions(conn, name, transactions)
+        if portfolio_points:
+            _insert_portfolio_snapshots(conn, name, portfolio_points)
+    if portfolio_points and time.monotonic() - _last_compaction.get(name, float("-inf")) > PORTFOLIO_COMPACT_EVERY_SECONDS:
+        compact_portfolio_series(name)
 
+@_timed("read_account")
 def read_account(name):
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT account FROM accounts WHERE name = ?', (name.lower(),))
-        row = cursor.fetchone()
-        return json.loads(row[0]) if row else None
+    """
+    Read what trading an account needs: totals over its transactions stand in for the
+    transactions themselves (see read_account_transactions), so the cost doesn't grow with history.
     
+    Args:
+        name (str): The account name
+        
+    Returns:
+        dict: name, balance, strategy, holdings, spent (sum of quantity * price over every
+        transaction), transaction_count and the most recent portfolio_value_time_series
+        points; None if the account is not stored
+    """
+    name = name.lower()
+    with pool.transaction(write=False) as conn:
+        row = conn.execute('SELECT balance, strategy FROM accounts WHERE name = ?', (name,)).fetchone()
+        if not row:
+            return None
+        holdings = conn.execute(
+            'SELECT symbol, quantity FROM holdings WHERE name = ?', (name,)
+        ).fetchall()
+        spent, transaction_count = conn.execute('''
+            SELECT COALESCE(SUM(quantity * price), 0), COUNT(*) FROM transactions
+            WHERE name = ?
+        ''', (name,)).fetchone()
+        points = conn.execute('''
+            SELECT datetime, value FROM (
+                SELECT id, datetime, value FROM portfolio_snapshots
+                WHERE name = ?
+                ORDER BY id DESC
+                LIMIT ?
+            ) ORDER BY id
+        ''', (name, PORTFOLIO_RECENT_POINTS)).fetchall()
+    return {
+        "name": name,
+        "balance": row[0],
+        "strategy": row[1],
+        "holdings": dict(holdings),
+        "spent": spent,
+        "transaction_count": transaction_count,
+        "portfolio_value_time_series": points,
+    }
+
+@_timed("read_account_transactions")
+def read_account_transactions(name, last_n=None):
+    """
+    Read an account's transactions with their rationale, oldest first.
+    
+    Args:
+        name (str): The account name
+        last_n (int): Only the newest last_n transactions (default: all of them)
+        
+    Returns:
+        list: Transaction dicts (symbol, quantity, price, timestamp, rationale), oldest first
+    """
+    with pool.transaction(write=False) as conn:
+        rows = conn.execute('''
+            SELECT symbol, quantity, price, timestamp, rationale FROM transactions
+            WHERE name = ?
+            ORDER BY id DESC
+            LIMIT ?
+        ''', (name.lower(), -1 if last_n is None else last_n)).fetchall()
+    return [
+        {"symbol": symbol, "quantity": quantity, "price": price, "timestamp": timestamp, "rationale": rationale}
+        for symbol, quantity, price, timestamp, rationale in reversed(rows)
+    ]
+
+@_timed("read_account_summary")
+def read_account_summary(name):
+    """
+    Read an account's balance, strategy and holdings, with totals over its transactions
+    instead of the transactions themselves.
+    
+    Args:
+        name (str): The account name
+        
+    Returns:
+        dict: name, balance, strategy, holdings, spent (sum of quantity * price over every
+        transaction) and last_transaction_id (0 if none); None if the account is not stored
+    """
+    name = name.lower()
+    with read_pool.transaction(write=False) as conn:
+        row = conn.execute('SELECT balance, strategy FROM accounts WHERE name = ?', (name,)).fetchone()
+        if not row:
+            return None
+        holdings = conn.execute('SELECT symbol, quantity FROM holdings WHERE name = ?', (name,)).fetchall()
+        spent, last_transaction_id = conn.execute('''
+            SELECT COALESCE(SUM(quantity * price), 0), COALESCE(MAX(id), 0) FROM transactions
+            WHERE name = ?
+        ''', (name,)).fetchone()
+    return {
+        "name": name,
+        "balance": row[0],
+        "strategy": row[1],
+        "holdings": dict(holdings),
+        "spent": spent,
+        "last_transaction_id": last_transaction_id,
+    }
+
+@_timed("read_transactions")
+def read_transactions(name: str, before_id: int | None = None, limit: int = 20):
+    """
+    Read a page of an account's transactions, newest first, without their rationale.
+    
+    Args:
+        name (str): The account name
+        before_id (int): Only transactions with a smaller id (default: the newest ones)
+        limit (int): Page size
+        
+    Returns:
+        list: (id, timestamp, symbol, quantity, price) tuples, newest first; pass the last id
+        as before_id to get the next (older) page
+    """
+    return read_pool.connection().execute('''
+        SELECT id, timestamp, symbol, quantity, price FROM transactions
+        WHERE name = ? AND id < ?
+        ORDER BY id DESC
+        LIMIT ?
+    ''', (name.lower(), before_id if before_id is not None else 2 ** 63 - 1, limit)).fetchall()
+
+@_timed("read_transactions_after")
+def read_transactions_after(name: str, after_id: int, limit: int = 1000):
+    """
+    Read an account's transactions made after a given transaction id, for incremental updates.
+    
+    Args:
+        name (str): The account name
+        after_id (int): The newest transaction id already seen
+        limit (int): Maximum number of transactions to return (the oldest ones after after_id)
+        
+    Returns:
+        list: (id, timestamp, symbol, quantity, price) tuples, newest first
+    """
+    rows = read_pool.connection().execute('''
+        SELECT id, timestamp, symbol, quantity, price FROM transactions
+        WHERE name = ? AND id > ?
+        ORDER BY id
+        LIMIT ?
+    ''', (name.lower(), after_id, limit)).fetchall()
+    return rows[::-1]
+
+def read_transaction_rationale(transaction_id: int) -> str | None:
+    """ The rationale recorded with a transaction (None if it no longer exists). """
+    row = read_pool.connection().execute(
+        'SELECT rationale FROM transactions WHERE id = ?', (transaction_id,)
+    ).fetchone()
+    return row[0] if row else None
+
+@_timed("read_account_revisions")
+def read_account_revisions():
+    """
+    How many times each account has been saved, a cheap way to tell whether it changed.
+    
+    Returns:
+        dict: name -> revision, for every stored account
+    """
+    return dict(read_pool.connection().execute('SELECT name, revision FROM accounts').fetchall())
+
+def _bucket_start(timestamp: str, seconds: int) -> str:
+    """Truncate a 'YYYY-MM-DD HH:MM:SS' string to the start of its minute, hour or day."""
+    if seconds >= 86400:
+        return timestamp[:10] + " 00:00:00"
+    if seconds >= 3600:
+        return timestamp[:13] + ":00:00"
+    if seconds >= 60:
+        return timestamp[:16] + ":00"
+    return timestamp
+
+def _rollup(rows, seconds):
+    """Fold (datetime, open, high, low, close) rows, oldest first, into OHLC buckets."""
+    buckets = {}
+    for timestamp, open_, high, low, close in rows:
+        key = _bucket_start(timestamp, seconds)
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [open_, high, low, close]
+        else:
+            bucket[1] = max(bucket[1], high)
+            bucket[2] = min(bucket[2], low)
+            bucket[3] = close
+    return buckets
+
+_last_compaction: dict[str, float] = {}
+
+@_timed("compact_portfolio_series")
+def compact_portfolio_series(name: str, now: datetime | None = None):
+    """
+    Roll portfolio history that has aged out of its tier into the next coarser tier.
+
+    Cutoffs are aligned to the coarser bucket, so every bucket is built from complete data
+    exactly once and each tier stays bounded by its retention window.
+    """
+    name = name.lower()
+    now = now or datetime.now()
+    with pool.transaction() as conn:
+        for (source, _, retention), (target, seconds, _) in zip(PORTFOLIO_TIERS, PORTFOLIO_TIERS[1:]):
+            cutoff = _bucket_start((now - retention).strftime(DATETIME_FORMAT), seconds)
+            if source == "raw":
+                rows = conn.execute('''
+                    SELECT datetime, value, value, value, value FROM portfolio_snapshots
+                    WHERE name = ? AND datetime < ?
+                    ORDER BY id
+                ''', (name, cutoff)).fetchall()
+            else:
+                rows = conn.execute('''
+                    SELECT bucket, open, high, low, close FROM portfolio_rollups
+                    WHERE name = ? AND resolution = ? AND bucket < ?
+                    ORDER BY bucket
+                ''', (name, source, cutoff)).fetchall()
+            if not rows:
+                continue
+            conn.executemany('''
+                INSERT INTO portfolio_rollups (name, resolution, bucket, open, high, low, close)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name, resolution, bucket) DO UPDATE SET
+                    high=max(high, excluded.high), low=min(low, excluded.low), close=excluded.close
+            ''', [(name, target, bucket, *ohlc) for bucket, ohlc in _rollup(rows, seconds).items()])
+            if source == "raw":
+                conn.execute('DELETE FROM portfolio_snapshots WHERE name = ? AND datetime < ?', (name, cutoff))
+            else:
+                conn.execute(
+                    'DELETE FROM portfolio_rollups WHERE name = ? AND resolution = ? AND bucket < ?',
+                    (name, source, cutoff),
+                )
+    _last_compaction[name] = time.monotonic()
+
+@_timed("read_portfolio_series")
+def read_portfolio_series(name: str, start: str | None = None, end: str | None = None, max_points=PORTFOLIO_CHART_POINTS):
+    """
+    Read portfolio value history at a resolution suited to the requested window.
+    
+    Args:
+        name (str): The account name
+        start (str): Earliest 'YYYY-MM-DD HH:MM:SS' to include (default: all history)
+        end (str): Latest 'YYYY-MM-DD HH:MM:SS' to include (default: now)
+        max_points (int): Upper bound on the number of points returned
+        
+    Returns:
+        list: (datetime, value) tuples, oldest first; value is the close of each bucket
+    """
+    name = name.lower()
+    start = start or "0000-00-00 00:00:00"
+    end = end or "9999-99-99 99:99:99"
+    with read_pool.transaction(write=False) as conn:
+        rows = conn.execute('''
+            SELECT bucket, close FROM portfolio_rollups
+            WHERE name = ? AND bucket BETWEEN ? AND ?
+        ''', (name, start, end)).fetchall()
+        rows += conn.execute('''
+            SELECT datetime, value FROM portfolio_snapshots
+            WHERE name = ? AND datetime BETWEEN ? AND ?
+            ORDER BY id
+        ''', (name, start, end)).fetchall()
+    rows.sort(key=lambda row: row[0])
+    if len(rows) <= max_points:
+        return rows
+    span = (datetime.strptime(rows[-1][0], DATETIME_FORMAT) - datetime.strptime(rows[0][0], DATETIME_FORMAT)).total_seconds()
+    seconds = next((s for _, s, _ in PORTFOLIO_TIERS[1:] if span / s <= max_points), PORTFOLIO_TIERS[-1][1])
+    buckets = {}
+    for timestamp, value in rows:
+        buckets[_bucket_start(timestamp, seconds)] = value
+    points = list(buckets.items())
+    if len(points) > max_points:
+        # Even daily buckets are too many for this window; thin them evenly, keeping the last point
+        step = -(-len(points) // max_points)
+        points = points[::-1][::step][::-1]
+    return points
+
+@_timed("read_latest_portfolio_values")
+def read_latest_portfolio_values():
+    """
+    Read every account's most recent portfolio value in one query, e.g. for a leaderboard.
+    
+    Returns:
+        dict: name -> (datetime, value) of its latest point, from the raw snapshots or, once
+        those have been compacted, the finest rollup; (None, balance) if it has no history
+    """
+    latest_rollup = '''
+        SELECT {column} FROM portfolio_rollups
+        WHERE name = a.name AND resolution = '{resolution}'
+        ORDER BY bucket DESC LIMIT 1
+    '''
+    rollup_columns = [
+        [f"({latest_rollup.format(column=column, resolution=resolution)})" for resolution, _, _ in PORTFOLIO_TIERS[1:]]
+        for column in ("bucket", "close")
+    ]
+    rows = read_pool.connection().execute(f'''
+        SELECT a.name,
+            COALESCE(s.datetime, {", ".join(rollup_columns[0])}),
+            COALESCE(s.value, {", ".join(rollup_columns[1])}, a.balance)
+        FROM accounts a
+        LEFT JOIN portfolio_snapshots s
+            ON s.id = (SELECT MAX(id) FROM portfolio_snapshots WHERE name = a.name)
+    ''').fetchall()
+    return {name: (timestamp, value) for name, timestamp, value in rows}
+
+# When this process last tried to claim log retention; the claim itself is shared through the database
+_last_log_compaction_check = float("-inf")
+
+def _claim_maintenance(task: str, every_seconds: float) -> bool:
+    """
+    Claim this round of a housekeeping task for the calling process.
+    
+    Args:
+        task (str): The task's name
+        every_seconds (float): How often the task should run, across every process
+        
+    Returns:
+        bool: True if the task last ran at least every_seconds ago (it is now recorded as
+        running); False if another process has it covered
+    """
+    now = time.time()
+    with pool.transaction() as conn:
+        conn.execute('INSERT OR IGNORE INTO maintenance (task, last_run) VALUES (?, 0)', (task,))
+        return conn.execute(
+            'UPDATE maintenance SET last_run = ? WHERE task = ? AND last_run <= ?', (now, task, now - every_seconds)
+        ).rowcount == 1
+
+def _delete_logs(where: str, params: tuple) -> int:
+    deleted = 0
+    while True:
+        with pool.transaction() as conn:
+            count = conn.execute(f'''
+                DELETE FROM logs WHERE id IN (SELECT id FROM logs WHERE {where} LIMIT ?)
+            ''', (*params, LOG_DELETE_BATCH)).rowcount
+        deleted += count
+        if count < LOG_DELETE_BATCH:
+            return deleted
+
+@_timed("compact_logs")
+def compact_logs(retention_days: float = LOG_RETENTION_DAYS, max_rows_per_name: int = LOG_MAX_ROWS_PER_NAME, now: datetime | None = None):
+    """
+    Delete logs past their retention, in small batches.
+    
+    Args:
+        retention_days (float): Delete entries older than this many days (0 keeps them)
+        max_rows_per_name (int): Keep at most this many newest entries per name (0 keeps all)
+        now (datetime): Current UTC time, for tests
+        
+    Returns:
+        int: Number of entries deleted
+    """
+    deleted = 0
+    conn = pool.connection()
+    if retention_days:
+        cutoff = ((now or datetime.now(timezone.utc)) - timedelta(days=retention_days)).strftime(DATETIME_FORMAT)
+        # Ids follow write order, so everything before the first recent row has expired; only
+        # the expired rows are scanned to find it
+        boundary = conn.execute(
+            'SELECT id FROM logs WHERE datetime >= ? ORDER BY id LIMIT 1', (cutoff,)
+        ).fetchone()
+        if boundary is None:
+            boundary = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM logs').fetchone()
+        deleted += _delete_logs('id < ?', (boundary[0],))
+    if max_rows_per_name:
+        # Distinct names by skipping through the (name, id) index rather than scanning it
+        names = [row[0] for row in conn.execute('''
+            WITH RECURSIVE names(name) AS (
+                SELECT MIN(name) FROM logs
+                UNION ALL
+                SELECT (SELECT MIN(name) FROM logs WHERE name > names.name) FROM names WHERE names.name IS NOT NULL
+            )
+            SELECT name FROM names WHERE name IS NOT NULL
+        ''')]
+        for name in names:
+            oldest_kept = conn.execute(
+                'SELECT id FROM logs WHERE name = ? ORDER BY id DESC LIMIT 1 OFFSET ?', (name, max_rows_per_name - 1)
+            ).fetchone()
+            if oldest_kept:
+                deleted += _delete_logs('name = ? AND id < ?', (name, oldest_kept[0]))
+    if deleted:
+        registry.counter("log_rows_compacted_total", "Log rows deleted by retention").inc(deleted)
+    return deleted
+
+@_timed("insert_logs")
+def _insert_logs(rows):
+    with pool.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO logs (name, datetime, type, message)
+            VALUES (?, ?, ?, ?)
+        ''', rows)
+    # Runs on the log writer's thread, so retention never delays the code that logged. Every
+    # process that logs (MCP servers, workers) checks in now and then, but only the one that
+    # claims the round in the database compacts
+    global _last_log_compaction_check
+    if time.monotonic() - _last_log_compaction_check > LOG_COMPACT_EVERY_SECONDS:
+        _last_log_compaction_check = time.monotonic()
+        if _claim_maintenance("compact_logs", LOG_COMPACT_EVERY_SECONDS):
+            compact_logs()
+
+# Log rows are buffered and written in bulk off the caller's thread (and event loop)
+log_writer = LogWriter(_insert_logs)
+atexit.register(log_writer.close)
+
+def _collect_log_writer_metrics(metrics):
+    metrics.gauge("log_queue_depth", "Log rows waiting for the background writer").set(log_writer.queue_depth)
+    metrics.counter("log_rows_dropped_total", "Log rows dropped because the queue was full").set(log_writer.dropped)
+
+registry.add_collector(_collect_log_writer_metrics)
+
 def write_log(name: str, type: str, message: str):
     """
-    Write a log entry to the logs table.
+    Queue a log entry for the logs table; it is written by the background log writer.
     
     Args:
         name (str): The name associated with the log
         type (str): The type of log entry
         message (str): The log message
     """
-    now = datetime.now().isoformat()
-    
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO logs (name, datetime, type, message)
-            VALUES (?, datetime('now'), ?, ?)
-        ''', (name.lower(), type, message))
-        conn.commit()
+    # Same UTC format as SQLite's datetime('now'), captured when the event happens
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    log_writer.submit((name.lower(), now, type, message))
 
+@_timed("read_log")
 def read_log(name: str, last_n=10):
     """
     Read the most recent log entries for a given name.
@@ -93,31 +682,135 @@ def read_log(name: str, last_n=10):
     Returns:
         list: A list of tuples containing (datetime, type, message)
     """
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT datetime, type, message FROM logs 
-            WHERE name = ? 
-            ORDER BY datetime DESC
+    cursor = read_pool.connection().execute('''
+        SELECT datetime, type, message FROM logs 
+        WHERE name = ? 
+        ORDER BY id DESC
+        LIMIT ?
+    ''', (name.lower(), last_n))
+    
+    return reversed(cursor.fetchall())
+
+@_timed("read_logs_after")
+def read_logs_after(after_id: int, limit: int = 1000, name: str | None = None):
+    """
+    Read log entries written after a given log id, for incremental feeds and paging forward.
+    
+    Args:
+        after_id (int): The last log id already seen
+        limit (int): Maximum number of entries to return
+        name (str): Only entries for this name (default: every name)
+        
+    Returns:
+        list: (id, name, datetime, type, message) tuples, oldest first
+    """
+    if name is None:
+        return read_pool.connection().execute('''
+            SELECT id, name, datetime, type, message FROM logs
+            WHERE id > ?
+            ORDER BY id
             LIMIT ?
-        ''', (name.lower(), last_n))
+        ''', (after_id, limit)).fetchall()
+    return read_pool.connection().execute('''
+        SELECT id, name, datetime, type, message FROM logs
+        WHERE name = ? AND id > ?
+        ORDER BY id
+        LIMIT ?
+    ''', (name.lower(), after_id, limit)).fetchall()
+
+@_timed("read_logs_before")
+def read_logs_before(name: str, before_id: int | None = None, limit: int = 50):
+    """
+    Read a page of a name's log entries older than a given log id, for paging back through history.
+    
+    Args:
+        name (str): The name to retrieve logs for
+        before_id (int): Only entries with a smaller id (default: the newest entries)
+        limit (int): Page size
         
-        return reversed(cursor.fetchall())
-
-def write_market(date: str, data: dict) -> None:
-    data_json = json.dumps(data)
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO market (date, data)
-            VALUES (?, ?)
-            ON CONFLICT(date) DO UPDATE SET data=excluded.data
-        ''', (date, data_json))
-        conn.commit()
-
-def read_market(date: str) -> dict | None:
-    with sqlite3.connect(DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT data FROM market WHERE date = ?', (date,))
-        row = cursor.fetchone()
-        return json.loads(row[0]) if row else None
\ No newline at end of file
+    Returns:
+        list: (id, name, datetime, type, message) tuples, oldest first; pass the first id
+        as before_id to get the previous page
+    """
+    rows = read_pool.connection().execute('''
+        SELECT id, name, datetime, type, message FROM logs
+        WHERE name = ? AND id < ?
+        ORDER BY id DESC
+        LIMIT ?
+    ''', (name.lower(), before_id if before_id is not None else 2 ** 63 - 1, limit)).fetchall()
+    return rows[::-1]
+
+def read_last_log_id() -> int:
+    """ The newest log id (0 if there are no logs). """
+    return read_pool.connection().execute('SELECT COALESCE(MAX(id), 0) FROM logs').fetchone()[0]
+
+@_timed("write_prices")
+def write_prices(prices: dict[str, float], fetched_at: float) -> None:
+    with pool.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO prices (symbol, price, fetched_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET price=excluded.price, fetched_at=excluded.fetched_at
+        ''', [(symbol, price, fetched_at) for symbol, price in prices.items()])
+
+@_timed("read_prices")
+def read_prices(symbols: list[str], since: float) -> dict[str, tuple[float, float]]:
+    """Return {symbol: (fetched_at, price)} for prices fetched at or after `since` (epoch seconds)."""
+    placeholders = ",".join("?" * len(symbols))
+    cursor = read_pool.connection().execute(f'''
+        SELECT symbol, fetched_at, price FROM prices
+        WHERE fetched_at >= ? AND symbol IN ({placeholders})
+    ''', (since, *symbols))
+    return {symbol: (fetched_at, price) for symbol, fetched_at, price in cursor.fetchall()}
+
+@_timed("write_bars")
+def write_bars(rows) -> None:
+    """Upsert (symbol, date, open, high, low, close, volume) rows."""
+    with pool.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO bars (symbol, date, open, high, low, close, volume)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(symbol, date) DO UPDATE SET
+                open=excluded.open, high=excluded.high, low=excluded.low,
+                close=excluded.close, volume=excluded.volume
+        ''', rows)
+
+def _read_bar_rows(sql: str, symbols: list[str], start: str, end: str) -> dict[str, list[tuple]]:
+    conn = pool.connection()
+    return {symbol: conn.execute(sql, (symbol, start, end)).fetchall() for symbol in symbols}
+
+@_timed("read_bars")
+def read_bars(symbols: list[str], start: str, end: str) -> dict[str, list[tuple]]:
+    """
+    Read daily bars for each symbol between two 'YYYY-MM-DD' dates (inclusive).
+    
+    Args:
+        symbols (list): The symbols to read
+        start (str): First date to include
+        end (str): Last date to include
+        
+    Returns:
+        dict: symbol -> list of (date, open, high, low, close, volume), oldest first
+    """
+    return _read_bar_rows('''
+        SELECT date, open, high, low, close, volume FROM bars
+        WHERE symbol = ? AND date BETWEEN ? AND ?
+        ORDER BY date
+    ''', symbols, start, end)
+
+@_timed("read_closes")
+def read_closes(symbols: list[str], start: str, end: str) -> dict[str, list[tuple]]:
+    """Like read_bars, but only (date, close) pairs."""
+    return _read_bar_rows('''
+        SELECT date, close FROM bars
+        WHERE symbol = ? AND date BETWEEN ? AND ?
+        ORDER BY date
+    ''', symbols, start, end)
+
+@_timed("read_bar_dates")
+def read_bar_dates(start: str, end: str) -> list[str]:
+    """Trading dates with at least one stored bar between start and end (inclusive)."""
+    cursor = pool.connection().execute(
+        'SELECT DISTINCT date FROM bars WHERE date BETWEEN ? AND ? ORDER BY date', (start, end)
+    )
+    return [row[0] for row in cursor.fetchall()]
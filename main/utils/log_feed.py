@@ -0,0 +1,146 @@
+import asyncio
+import os
+import threading
+from collections import deque
+
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.database import DB, log_writer, read_last_log_id, read_logs_after, read_logs_before
+from main.utils.metrics import registry
+
+# Latest lines kept in memory per name
+LOG_FEED_LINES = 50
+# How often the database files are checked for writes from other processes (a stat, not a query)
+LOG_FEED_POLL_SECONDS = 0.25
+# Rows fetched per query when catching up
+LOG_FEED_BATCH = 1000
+
+
+class LogFeed:
+    """
+    An in-memory tail of the logs table, shared by every dashboard viewer in this process.
+
+    New rows are read with one "id > cursor" query for all names, and only when something
+    was written: this process's log writer announces its flushes, and writes from other
+    processes (MCP servers, workers) show up as a change in the database or WAL file's
+    size or mtime. Viewers wait on a name's version and get woken when it has new lines,
+    so an idle dashboard costs no queries however many tabs are open.
+    """
+
+    def __init__(self, path: str = DB, lines: int = LOG_FEED_LINES, poll_interval: float = LOG_FEED_POLL_SECONDS):
+        self.paths = [path, f"{path}-wal"]
+        self.lines = lines
+        self.poll_interval = poll_interval
+        self._cursor = 0
+        self._tails: dict[str, deque] = {}
+        self._versions: dict[str, int] = {}
+        self._waiters: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._lock = threading.Lock()
+        # Held while reading the database, so seeding a name and catching up never interleave
+        self._read_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._signature = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._signature = self._stat()
+            self._cursor = read_last_log_id()
+            log_writer.subscribe(lambda batch: self._wake.set())
+            self._thread = threading.Thread(target=self._run, name="log-feed", daemon=True)
+            self._thread.start()
+
+    def _stat(self):
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                signature.append(None)
+        return signature
+
+    def _run(self) -> None:
+        while True:
+            woken = self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            signature = self._stat()
+            if not woken and signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                self.catch_up()
+            except Exception as e:
+                print(f"Log feed could not read new logs: {e}")
+
+    def catch_up(self) -> None:
+        """Read every row written since the cursor and wake the viewers of the names that got lines."""
+        changed = set()
+        with self._read_lock:
+            while True:
+                rows = read_logs_after(self._cursor, LOG_FEED_BATCH)
+                registry.counter("log_feed_queries_total", "Queries the dashboard log feed made").inc()
+                with self._lock:
+                    for row in rows:
+                        name = row[1]
+                        if name in self._tails:
+                            self._tails[name].append(row)
+                            self._versions[name] += 1
+                            changed.add(name)
+                    if rows:
+                        self._cursor = rows[-1][0]
+                if len(rows) < LOG_FEED_BATCH:
+                    break
+        with self._lock:
+            waiters = [waiter for name in changed for waiter in self._waiters.get(name, ())]
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def tail(self, name: str) -> tuple[int, list[tuple]]:
+        """
+        The name's latest lines and their version, loading them on the name's first use.
+
+        Returns:
+            (version, [(id, name, datetime, type, message), ...]) oldest first
+        """
+        name = name.lower()
+        self.start()
+        with self._lock:
+            if name in self._tails:
+                return self._versions[name], list(self._tails[name])
+        with self._read_lock:
+            with self._lock:
+                cursor = self._cursor
+            rows = [] if name in self._tails else read_logs_before(name, cursor + 1, self.lines)
+            with self._lock:
+                if name not in self._tails:
+                    self._tails[name] = deque(rows, maxlen=self.lines)
+                    self._versions[name] = 1
+                return self._versions[name], list(self._tails[name])
+
+    async def wait(self, name: str, version: int, timeout: float) -> tuple[int, list[tuple]]:
+        """The name's tail once its version differs from version, or as it is after timeout seconds."""
+        current, rows = self.tail(name)
+        if current != version:
+            return current, rows
+        name = name.lower()
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(name, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                self._waiters[name].discard(waiter)
+        return self.tail(name)
+
+
+# One feed per process, started by its first viewer
+log_feed = LogFeed()
@@ -0,0 +1,116 @@
+import os
+import threading
+import weakref
+from collections import deque
+from typing import Callable, Sequence
+
+BATCH_SIZE = 200
+FLUSH_INTERVAL_SECONDS = 0.5
+MAX_PENDING = 10_000
+
+
+class LogWriter:
+    """
+    Buffer log rows in memory and hand them to a sink in bulk from a background thread.
+
+    A flush happens when BATCH_SIZE rows are waiting or FLUSH_INTERVAL_SECONDS have passed,
+    whichever comes first. If the sink falls behind, at most MAX_PENDING rows are held and
+    the oldest ones are dropped (and counted) so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[Sequence[tuple]], None],
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_pending: int = MAX_PENDING,
+    ):
+        self._sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.dropped = 0
+        self._closed = False
+        self._listeners: list[Callable[[Sequence[tuple]], None]] = []
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # Runs in a forked child before any of its code can touch this writer
+            writer = weakref.ref(self)
+            os.register_at_fork(after_in_child=lambda: writer() and writer()._reset())
+
+    def _reset(self) -> None:
+        # A forked child starts empty: the parent still owns (and writes) the rows it had
+        # queued, and its threads, and the locks they may have held mid-fork, don't carry over
+        self._pending: deque[tuple] = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def subscribe(self, listener: Callable[[Sequence[tuple]], None]) -> None:
+        """Call listener with each batch once it has been written (from the writing thread)."""
+        self._listeners.append(listener)
+
+    def submit(self, row: tuple) -> None:
+        """Queue a row without touching the database; never blocks on I/O."""
+        if self._closed:
+            self._write([row])
+            return
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(row)
+            self._ensure_thread()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._pending)
+                self._pending.clear()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: list[tuple]) -> None:
+        try:
+            self._sink(batch)
+        except Exception as e:
+            print(f"Failed to write {len(batch)} log entries: {e}")
+            return
+        for listener in self._listeners:
+            try:
+                listener(batch)
+            except Exception as e:
+                print(f"Log listener {listener!r} failed: {e}")
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left; later rows are written directly."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        self.flush()
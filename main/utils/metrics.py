@@ -0,0 +1,189 @@
+import functools
+import math
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable
+
+# Upper bounds (seconds) of the histogram buckets, roughly log-spaced from 1 ms to 5 min
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+# Recent observations kept per histogram for percentiles
+WINDOW_SIZE = 2048
+PERCENTILES = (50, 95, 99)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values (0.0 when there are none)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        """Mirror a total that another component already counts (e.g. PriceCache hits)."""
+        self.value = value
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Cumulative bucket counts for export, plus a window of recent values for percentiles."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS, window: int = WINDOW_SIZE):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self.recent.append(value)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.bucket_counts[i] += 1
+
+    def window(self) -> list[float]:
+        with self._lock:
+            return list(self.recent)
+
+    def percentiles(self, ps: Iterable[float] = PERCENTILES) -> dict[str, float]:
+        values = sorted(self.window())
+        return {f"p{p:g}": percentile(values, p) for p in ps}
+
+
+class MetricsRegistry:
+    """
+    Named, labelled metrics for this process.
+
+    Each (name, labels) pair gets its own metric on first use, e.g.
+    registry.histogram("span_duration_seconds", trader="warren", type="generation").observe(1.2)
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, dict[Labels, Counter | Gauge | Histogram]] = {}
+        self._kinds: dict[str, type] = {}
+        self.descriptions: dict[str, str] = {}
+        self._collectors: list[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]) -> None:
+        """Register a callback that refreshes sampled metrics (queue depths, cache stats) before export."""
+        self._collectors.append(collector)
+
+    def _get(self, kind: type, name: str, description: str, labels: dict[str, object]):
+        key = _labels(labels)
+        series = self._metrics.get(name)
+        if series is not None and key in series:
+            return series[key]
+        with self._lock:
+            if self._kinds.setdefault(name, kind) is not kind:
+                raise ValueError(f"Metric {name} is a {self._kinds[name].__name__}, not a {kind.__name__}")
+            if description:
+                self.descriptions.setdefault(name, description)
+            series = self._metrics.setdefault(name, {})
+            if key not in series:
+                series[key] = kind()
+            return series[key]
+
+    def counter(self, name: str, description: str = "", /, **labels) -> Counter:
+        return self._get(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str = "", /, **labels) -> Gauge:
+        return self._get(Gauge, name, description, labels)
+
+    def histogram(self, name: str, description: str = "", /, **labels) -> Histogram:
+        return self._get(Histogram, name, description, labels)
+
+    def collect(self) -> list[tuple[str, type, dict[Labels, Counter | Gauge | Histogram]]]:
+        """Every metric name with its kind and labelled series, for exporters."""
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception as e:
+                print(f"Metrics collector {collector.__name__} failed: {e}")
+        with self._lock:
+            return [(name, self._kinds[name], dict(series)) for name, series in self._metrics.items()]
+
+    def summary(self, name: str, by: Iterable[str]) -> list[dict]:
+        """
+        Percentiles of a histogram, merged over every label not listed in `by`.
+
+        Args:
+            name: Histogram name, e.g. "span_duration_seconds"
+            by: Labels to group on, e.g. ("trader", "type")
+
+        Returns:
+            One row per group: the group's labels plus count, mean, p50, p95 and p99
+        """
+        by = tuple(by)
+        groups: dict[tuple, list[Histogram]] = {}
+        with self._lock:
+            series = dict(self._metrics.get(name, {}))
+        for labels, histogram in series.items():
+            values = dict(labels)
+            groups.setdefault(tuple(values.get(key, "") for key in by), []).append(histogram)
+        rows = []
+        for group, histograms in sorted(groups.items()):
+            recent = sorted(value for histogram in histograms for value in histogram.window())
+            count = sum(histogram.count for histogram in histograms)
+            total = sum(histogram.sum for histogram in histograms)
+            row = dict(zip(by, group))
+            row["count"] = count
+            row["mean"] = total / count if count else 0.0
+            row.update({f"p{p:g}": percentile(recent, p) for p in PERCENTILES})
+            rows.append(row)
+        return rows
+
+
+# Shared by everything in this process
+registry = MetricsRegistry()
+
+
+def latency_summary(by: Iterable[str] = ("trader", "type")) -> list[dict]:
+    """p50/p95/p99 span latency per trader and span type (or any other grouping, e.g. ("name",))."""
+    return registry.summary("span_duration_seconds", by)
+
+
+def timed(name: str, description: str = "", **labels):
+    """Decorator observing each call's wall time (successful or not) in a histogram."""
+
+    def decorate(fn):
+        histogram = registry.histogram(name, description, **labels)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+
+        return wrapper
+
+    return decorate
@@ -0,0 +1,152 @@
+import atexit
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+import sys
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry, registry
+
+load_dotenv(override=True)
+
+# Serve /metrics for scraping (trading floor only; unset to disable)
+METRICS_PORT = os.getenv("METRICS_PORT")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# Write <process>-<pid>.prom files here for node_exporter's textfile collector (unset to disable)
+METRICS_TEXTFILE_DIR = os.getenv("METRICS_TEXTFILE_DIR")
+METRICS_EXPORT_INTERVAL_SECONDS = float(os.getenv("METRICS_EXPORT_INTERVAL_SECONDS", "15"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+TYPE_NAMES = {Counter: "counter", Gauge: "gauge", Histogram: "histogram"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(metrics: MetricsRegistry = registry, process: str | None = None, pid: int | None = None) -> str:
+    """The registry in the Prometheus text exposition format, optionally tagged with process="..." and pid="..."."""
+    base = (("process", process),) if process else ()
+    if pid is not None:
+        base = (*base, ("pid", str(pid)))
+    lines = []
+    for name, kind, series in sorted(metrics.collect(), key=lambda item: item[0]):
+        description = metrics.descriptions.get(name, name)
+        lines.append(f"# HELP {name} {_escape(description)}")
+        lines.append(f"# TYPE {name} {TYPE_NAMES[kind]}")
+        for labels, metric in sorted(series.items()):
+            labels = (*base, *labels)
+            if kind is Histogram:
+                for bound, count in zip(metric.buckets, metric.bucket_counts):
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', _format_value(bound))])} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {metric.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {metric.count}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(metric.value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, process: str | None = None, pid: int | None = None) -> None:
+    """Atomically replace path with the current metrics, as the textfile collector expects."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(render(process=process, pid=pid))
+    os.replace(tmp_path, path)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    process: str | None = None
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        data = render(process=self.process).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = METRICS_HOST, process: str | None = None) -> ThreadingHTTPServer:
+    handler = type("ProcessMetricsHandler", (MetricsHandler,), {"process": process})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_started: set[str] = set()
+
+
+def start_metrics_exporter(process: str, serve_http: bool = False) -> None:
+    """
+    Export this process's metrics as configured by the environment: a textfile rewritten every
+    METRICS_EXPORT_INTERVAL_SECONDS, and/or an HTTP /metrics endpoint.
+    Safe to call more than once; each process only starts its exporters the first time.
+
+    Several processes can share a name (an accounts server per worker, or per trader run
+    without the server pool), so each textfile is named and labelled with its pid, and
+    removed when the process exits rather than left to go stale.
+    """
+    if process in _started:
+        return
+    _started.add(process)
+    if serve_http and METRICS_PORT:
+        try:
+            start_http_server(int(METRICS_PORT), process=process)
+            print(f"Serving metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"Could not serve metrics on port {METRICS_PORT}: {e}")
+    if METRICS_TEXTFILE_DIR:
+        os.makedirs(METRICS_TEXTFILE_DIR, exist_ok=True)
+        pid = os.getpid()
+        path = os.path.join(METRICS_TEXTFILE_DIR, f"{process}-{pid}.prom")
+        stop = threading.Event()
+        lock = threading.Lock()
+
+        def export():
+            try:
+                with lock:
+                    if not stop.is_set():
+                        write_textfile(path, process=process, pid=pid)
+            except OSError as e:
+                print(f"Could not write metrics to {path}: {e}")
+
+        def run():
+            while not stop.wait(METRICS_EXPORT_INTERVAL_SECONDS):
+                export()
+
+        threading.Thread(target=run, name="metrics-textfile", daemon=True).start()
+
+        def remove_textfile():
+            with lock:
+                stop.set()
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Could not remove metrics file {path}: {e}")
+
+        atexit.register(remove_textfile)
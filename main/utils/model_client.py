@@ -1,3 +1,4 @@
+import functools
 import os
 
 from agents import Model, OpenAIChatCompletionsModel
@@ -18,21 +19,23 @@ def active_model_name() -> str:
     return _env_required("MODEL")
 
 
-def create_agent_model() -> Model:
-    client = AsyncOpenAI(
+@functools.cache
+def _shared_client() -> AsyncOpenAI:
+    # One client (and HTTP connection pool) for every trader, however many there are
+    return AsyncOpenAI(
         base_url=_env_required("BASE_URL"),
         api_key=_env_required("API_KEY"),
     )
-    return OpenAIChatCompletionsModel(
-        model=active_model_name(),
-        openai_client=client,
-    )
 
 
-def configured_model_names() -> list[Model]:
-    model = create_agent_model()
-    return [model] * 4
+@functools.cache
+def create_agent_model(model: str | None = None) -> Model:
+    """The agents model for a model ID (MODEL by default), shared by every trader that uses it."""
+    return OpenAIChatCompletionsModel(
+        model=model or active_model_name(),
+        openai_client=_shared_client(),
+    )
 
 
-def configured_model_display_names() -> list[str]:
-    return [active_model_name()] * 4
+def model_display_name(model: str | None = None) -> str:
+    return model or active_model_name()
@@ -1,6 +1,9 @@
 from agents import TracingProcessor, Trace, Span
+from datetime import datetime
 import secrets
 import string
+import threading
+import time
 
 import os
 import sys
@@ -8,29 +11,53 @@ root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os
 if root_dir not in sys.path:
     sys.path.insert(0, root_dir)
 
-from main.utils.database import write_log
+from main.utils.database import write_log, log_writer
+from main.utils.metrics import registry
 
 ALPHANUM = string.ascii_lowercase + string.digits 
+# The random part never contains the "0" separator, so tags (trader names) may
+SUFFIX_ALPHABET = ALPHANUM.replace("0", "")
 
 def make_trace_id(tag: str) -> str:
     """
-    Return a string of the form 'trace_<tag><random>',
+    Return a string of the form 'trace_<tag>0<random>',
     where the total length after 'trace_' is 32 chars.
     """
     tag += "0"
     pad_len = 32 - len(tag)
-    random_suffix = ''.join(secrets.choice(ALPHANUM) for _ in range(pad_len))
+    random_suffix = ''.join(secrets.choice(SUFFIX_ALPHABET) for _ in range(pad_len))
     return f"trace_{tag}{random_suffix}"
 
+def trader_name(trace_or_span: Trace | Span) -> str | None:
+    """The trader a trace belongs to, recovered from the tag make_trace_id put in its id."""
+    trace_id = trace_or_span.trace_id
+    name = trace_id.split("_")[1]
+    if '0' in name:
+        return name.rsplit("0", 1)[0]
+    else:
+        return None
+
+def span_duration(span: Span) -> float | None:
+    """Seconds between a finished span's start and end timestamps."""
+    if not span.started_at or not span.ended_at:
+        return None
+    started = datetime.fromisoformat(span.started_at)
+    ended = datetime.fromisoformat(span.ended_at)
+    return (ended - started).total_seconds()
+
+def span_label(span: Span) -> str:
+    """What the span was about: the tool, agent or MCP server name, or the model for generations."""
+    data = span.span_data
+    for attribute in ("name", "server", "model"):
+        value = getattr(data, attribute, None)
+        if value:
+            return str(value)
+    return ""
+
 class LogTracer(TracingProcessor):
 
     def get_name(self, trace_or_span: Trace | Span) -> str | None:
-        trace_id = trace_or_span.trace_id
-        name = trace_id.split("_")[1]
-        if '0' in name:
-            return name.split("0")[0]
-        else:
-            return None
+        return trader_name(trace_or_span)
 
     def on_trace_start(self, trace) -> None:
         name = self.get_name(trace)
@@ -71,12 +98,77 @@ class LogTracer(TracingProcessor):
                     message += f" {span.span_data.name}"
                 if hasattr(span.span_data, "server") and span.span_data.server:
                     message += f" {span.span_data.server}"
+            duration = span_duration(span)
+            if duration is not None:
+                message += f" ({duration:.2f}s)"
             if span.error:
                 message += f" {span.error}"
             write_log(name, type, message)
 
+    def force_flush(self) -> None:
+        log_writer.flush()
+
+    def shutdown(self) -> None:
+        log_writer.close()
+
+class MetricsTracer(TracingProcessor):
+    """Records span and cycle durations, and token usage, into the metrics registry."""
+
+    def __init__(self):
+        self._trace_starts: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_trace_start(self, trace) -> None:
+        with self._lock:
+            self._trace_starts[trace.trace_id] = time.monotonic()
+
+    def on_trace_end(self, trace) -> None:
+        with self._lock:
+            started = self._trace_starts.pop(trace.trace_id, None)
+        name = trader_name(trace)
+        if name and started is not None:
+            registry.histogram(
+                "cycle_duration_seconds", "Wall time of a whole trading cycle", trader=name
+            ).observe(time.monotonic() - started)
+
+    def on_span_start(self, span) -> None:
+        pass
+
+    def on_span_end(self, span) -> None:
+        name = trader_name(span)
+        duration = span_duration(span)
+        if not name or duration is None or not span.span_data:
+            return
+        span_type = span.span_data.type
+        registry.histogram(
+            "span_duration_seconds",
+            "Span wall time by trader, span type and tool/agent/server name",
+            trader=name,
+            type=span_type,
+            name=span_label(span),
+        ).observe(duration)
+        if span.error:
+            registry.counter("span_errors_total", "Spans that ended with an error", trader=name, type=span_type).inc()
+        for kind, tokens in self._token_usage(span).items():
+            registry.counter("tokens_total", "Model tokens used", trader=name, kind=kind).inc(tokens)
+
+    def _token_usage(self, span) -> dict[str, int]:
+        usage = getattr(span.span_data, "usage", None)
+        if usage is None:
+            response = getattr(span.span_data, "response", None)
+            usage = getattr(response, "usage", None)
+        if usage is None:
+            return {}
+        if not isinstance(usage, dict):
+            usage = {key: getattr(usage, key, None) for key in ("input_tokens", "output_tokens")}
+        return {
+            kind.removesuffix("_tokens"): int(usage[kind])
+            for kind in ("input_tokens", "output_tokens")
+            if isinstance(usage.get(kind), (int, float))
+        }
+
     def force_flush(self) -> None:
         pass
 
     def shutdown(self) -> None:
-        pass
\ No newline at end of file
+        pass
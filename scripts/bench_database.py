@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Compare connect-per-call SQLite access with the pooled connection layer."""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.connections import ConnectionPool
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS accounts (name TEXT PRIMARY KEY, account TEXT)",
+    """
+    CREATE TABLE IF NOT EXISTS logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        datetime DATETIME,
+        type TEXT,
+        message TEXT
+    )
+    """,
+]
+UPSERT_ACCOUNT = """
+    INSERT INTO accounts (name, account) VALUES (?, ?)
+    ON CONFLICT(name) DO UPDATE SET account=excluded.account
+"""
+SELECT_ACCOUNT = "SELECT account FROM accounts WHERE name = ?"
+INSERT_LOG = "INSERT INTO logs (name, datetime, type, message) VALUES (?, datetime('now'), ?, ?)"
+SELECT_LOG = "SELECT datetime, type, message FROM logs WHERE name = ? ORDER BY datetime DESC LIMIT ?"
+
+ACCOUNT = json.dumps({"name": "warren", "balance": 10_000.0, "holdings": {"AAPL": 5}})
+
+
+class ConnectPerCall:
+    """The access pattern database.py used before pooling: connect, commit, close."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write(self, sql, params):
+        with sqlite3.connect(self.path) as conn:
+            conn.execute(sql, params)
+            conn.commit()
+        conn.close()
+
+    def read(self, sql, params):
+        with sqlite3.connect(self.path) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        conn.close()
+        return rows
+
+
+class Pooled:
+    def __init__(self, path: str):
+        self.pool = ConnectionPool(path)
+
+    def write(self, sql, params):
+        with self.pool.transaction() as conn:
+            conn.execute(sql, params)
+
+    def read(self, sql, params):
+        return self.pool.connection().execute(sql, params).fetchall()
+
+
+def run(backend, ops: int) -> float:
+    start = time.perf_counter()
+    for i in range(ops):
+        step = i % 4
+        if step == 0:
+            backend.write(UPSERT_ACCOUNT, ("warren", ACCOUNT))
+        elif step == 1:
+            backend.read(SELECT_ACCOUNT, ("warren",))
+        elif step == 2:
+            backend.write(INSERT_LOG, ("warren", "account", "Retrieved account details"))
+        else:
+            backend.read(SELECT_LOG, ("warren", 13))
+    return ops / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2000, help="operations per backend")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, backend_cls in (("connect-per-call", ConnectPerCall), ("pooled", Pooled)):
+            path = os.path.join(tmp, f"{label}.db")
+            with sqlite3.connect(path) as conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+            conn.close()
+            backend = backend_cls(path)
+            results[label] = run(backend, args.ops)
+            print(f"{label:>18}: {results[label]:,.0f} ops/sec")
+            if isinstance(backend, Pooled):
+                backend.pool.close()
+        print(f"{'speedup':>18}: {results['pooled'] / results['connect-per-call']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Time log reads as the logs table grows, against a throwaway database.
+
+For each size the table is filled to that many rows spread over --names traders, then
+read_log (the (name, id) index), a keyset page further back (read_logs_before) and the
+query read_log ran before the index (a scan sorted by datetime) are timed for random
+traders. Finally compact_logs trims the largest table to --keep rows per trader.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+LEGACY_READ_LOG = """
+    SELECT datetime, type, message FROM logs NOT INDEXED
+    WHERE name = ?
+    ORDER BY datetime DESC
+    LIMIT ?
+"""
+TYPES = ["trace", "agent", "function", "generation", "response", "account"]
+
+
+def fill(pool, names: list[str], start: int, end: int) -> None:
+    """Insert rows start..end, one second apart, round-robin over names like a busy floor."""
+    first = datetime.now(timezone.utc) - timedelta(seconds=end)
+    batch = []
+    for i in range(start, end):
+        timestamp = (first + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")
+        batch.append((names[i % len(names)], timestamp, TYPES[i % len(TYPES)], f"Benchmark log line {i}"))
+        if len(batch) == 50_000:
+            with pool.transaction() as conn:
+                conn.executemany("INSERT INTO logs (name, datetime, type, message) VALUES (?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        with pool.transaction() as conn:
+            conn.executemany("INSERT INTO logs (name, datetime, type, message) VALUES (?, ?, ?, ?)", batch)
+
+
+def time_ms(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--names", type=int, default=200, help="traders the rows are spread over")
+    parser.add_argument("--repeat", type=int, default=50, help="reads timed per query and size")
+    parser.add_argument("--legacy-repeat", type=int, default=5, help="reads of the unindexed query per size")
+    parser.add_argument("--keep", type=int, default=1000, help="rows per trader compact_logs keeps")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ACCOUNTS_DB"] = os.path.join(tmp, "accounts.db")
+        from main.utils.database import compact_logs, pool, read_log, read_logs_before
+
+        names = [f"trader{i}" for i in range(args.names)]
+        print(f"{'rows':>10} {'read_log ms':>11} {'page back ms':>12} {'legacy ms':>10}")
+        filled = 0
+        for rows in sorted(args.rows):
+            fill(pool, names, filled, rows)
+            filled = rows
+
+            def newest():
+                list(read_log(random.choice(names), 13))
+
+            def page_back():
+                name = random.choice(names)
+                page = read_logs_before(name, limit=50)
+                read_logs_before(name, page[0][0], 50)
+
+            def legacy():
+                pool.connection().execute(LEGACY_READ_LOG, (random.choice(names), 13)).fetchall()
+
+            print(
+                f"{rows:>10,} {time_ms(newest, args.repeat):>11.3f} {time_ms(page_back, args.repeat):>12.3f} "
+                f"{time_ms(legacy, args.legacy_repeat):>10.3f}"
+            )
+
+        started = time.perf_counter()
+        deleted = compact_logs(retention_days=0, max_rows_per_name=args.keep)
+        print(f"compact_logs: deleted {deleted:,} rows in {time.perf_counter() - started:.2f}s, "
+              f"read_log now {time_ms(newest, args.repeat):.3f} ms")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
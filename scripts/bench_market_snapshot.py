@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Compare load time, lookup time and RSS of the JSON market cache and the mmap snapshot."""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.markets.snapshot_store import MarketSnapshot, write_snapshot
+
+
+def make_market(count: int) -> dict[str, float]:
+    rng = random.Random(42)
+    market = {}
+    while len(market) < count:
+        symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(1, 5)))
+        market[symbol] = round(rng.uniform(1, 1000), 4)
+    return market
+
+
+def child(kind: str, path: str, lookups: int) -> None:
+    """Runs in a fresh interpreter so RSS reflects only this loader."""
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    start = time.perf_counter()
+    if kind == "json":
+        with sqlite3.connect(path) as conn:
+            market = json.loads(conn.execute("SELECT data FROM market").fetchone()[0])
+    else:
+        market = MarketSnapshot(path)
+    loaded = time.perf_counter()
+    symbols = list(market)
+    symbols = [symbols[i % len(symbols)] for i in range(0, lookups * 7, 7)]
+    lookup_start = time.perf_counter()
+    for symbol in symbols:
+        market.get(symbol, 0.0)
+    lookup_seconds = time.perf_counter() - lookup_start
+    rss_after = process.memory_info().rss
+    print(json.dumps({
+        "load_ms": (loaded - start) * 1000,
+        "lookup_us": lookup_seconds / len(symbols) * 1e6,
+        "rss_mb": (rss_after - rss_before) / 2**20,
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=12_000)
+    parser.add_argument("--lookups", type=int, default=1_000)
+    parser.add_argument("--child", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child, args.lookups)
+        return
+
+    market = make_market(args.symbols)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "market.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE market (date TEXT PRIMARY KEY, data TEXT)")
+            conn.execute("INSERT INTO market VALUES (?, ?)", ("2025-01-02", json.dumps(market)))
+        conn.close()
+        snap_path = os.path.join(tmp, "eod.snap")
+        write_snapshot(snap_path, market)
+        print(f"{args.symbols:,} symbols; snapshot file {os.path.getsize(snap_path) / 1024:.0f} KiB")
+        for kind, path in (("json", db_path), ("snapshot", snap_path)):
+            output = subprocess.run(
+                [sys.executable, __file__, "--lookups", str(args.lookups), "--child", kind, path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{kind:>9}: load {result['load_ms']:.2f} ms, lookup {result['lookup_us']:.2f} us, "
+                f"RSS +{result['rss_mb']:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""Measure Polygon snapshot lookup latency against a local stub server, with and without pooling."""
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.markets.polygon_client import create_client
+
+
+class StubPolygonHandler(BaseHTTPRequestHandler):
+    """Answers snapshot requests like api.polygon.io; every Nth request is a 429 to exercise retries."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    throttle_every = 0
+    requests = 0
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, delayed ACKs skew keep-alive timings
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.lock:
+            StubPolygonHandler.connections += 1
+
+    def do_GET(self):
+        with self.lock:
+            StubPolygonHandler.requests += 1
+            throttled = self.throttle_every and StubPolygonHandler.requests % self.throttle_every == 0
+        time.sleep(self.latency)
+        if throttled:
+            self._send(429, {"status": "ERROR", "error": "throttled"}, {"Retry-After": "0"})
+            return
+        ticker = self.path.split("?")[0].rsplit("/", 1)[-1]
+        body = {"status": "OK", "ticker": {"ticker": ticker, "min": {"c": 101.5}, "prevDay": {"c": 100.0}}}
+        self._send(200, body)
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def measure(label, lookups, client_for_call):
+    StubPolygonHandler.connections = 0
+    samples = []
+    for i in range(lookups):
+        client = client_for_call()
+        start = time.perf_counter()
+        client.get_snapshot_ticker("stocks", f"SYM{i % 50}")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(
+        f"{label:>16}: mean {statistics.mean(samples):.2f} ms, "
+        f"p50 {samples[len(samples) // 2]:.2f} ms, p95 {samples[int(len(samples) * 0.95)]:.2f} ms, "
+        f"{StubPolygonHandler.connections} connections"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="server-side delay per request")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every Nth request with 429")
+    args = parser.parse_args()
+
+    StubPolygonHandler.latency = args.latency_ms / 1000
+    StubPolygonHandler.throttle_every = args.throttle_every
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPolygonHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    settings = {"api_key": "stub", "base": base, "backoff_factor": 0.0}
+
+    try:
+        measure("client per call", args.lookups, lambda: create_client(**settings))
+        shared = create_client(**settings)
+        measure("shared pool", args.lookups, lambda: shared)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Measure how fast the offline market simulator prices a large universe, tick after tick."""
+import argparse
+import os
+import sys
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.markets.simulator import MarketSimulator
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--ticks", type=int, default=200, help="consecutive ticks priced one call at a time")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    symbols = [f"SIM{i:05d}" for i in range(args.symbols)]
+    simulator = MarketSimulator(seed=args.seed)
+    start_tick = simulator.tick()
+
+    start = time.perf_counter()
+    first = simulator.prices_at(symbols, start_tick)
+    print(f"first call ({args.symbols} symbols): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for tick in range(start_tick, start_tick + args.ticks):
+        simulator.prices_at(symbols, tick)
+    elapsed = time.perf_counter() - start
+    print(
+        f"per tick: {elapsed / args.ticks * 1000:.1f} ms, "
+        f"{args.symbols * args.ticks / elapsed:,.0f} prices/s one tick at a time"
+    )
+
+    start = time.perf_counter()
+    path = simulator.path(symbols, start_tick, args.ticks)
+    elapsed = time.perf_counter() - start
+    print(f"path ({args.ticks} ticks at once): {path.size / elapsed:,.0f} prices/s")
+
+    again = MarketSimulator(seed=args.seed).prices_at(symbols, start_tick)
+    print(f"fresh simulator reproduces tick {start_tick}: {again == first}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+Measure how the trading floor scales with the number of traders, without calling a model.
+
+Each roster size runs in its own process against a throwaway database and the simulated
+market. Traders go through the real roster, scheduler, Account and log writer; the LLM
+is replaced by a fixed think time, and account work runs in a worker thread the way the
+accounts server would serve it out of process. --cpu adds CPU-bound work per run
+(re-validating and serialising the account), and --workers splits each roster across
+that many processes sharing the database, like WORKER_PROCESSES does.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if root_dir not in sys.path:
+    sys.path.insert(0, root_dir)
+
+from main.utils.metrics import percentile
+
+SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "TSLA", "JPM", "XOM", "IBIT"]
+
+
+def account_work(name: str, cpu: float) -> None:
+    """What one trader run does to its account: read it, trade once or twice, report (after cpu seconds of busy work)."""
+    from main.accounts.accounts import Account
+    from main.utils.database import write_log
+
+    deadline = time.process_time() + cpu
+    while time.process_time() < deadline:
+        Account.model_validate_json(Account.get(name).model_dump_json())
+
+    account = Account.get(name)
+    account.report()
+    symbol = random.choice(SYMBOLS)
+    if account.holdings.get(symbol):
+        account.sell_shares(symbol, 1, "Benchmark sell")
+    else:
+        account.buy_shares(symbol, 2, "Benchmark buy")
+    for message in ("Started trace", "Started agent", "Ended agent", "Ended trace"):
+        write_log(name, "trace", message)
+
+
+async def run_floor(traders: int, seconds: float, interval: float, think: float, concurrency: int,
+                    cpu: float = 0.0, index: int = 0, count: int = 1) -> dict:
+    from main.trading.roster import load_roster
+    from main.trading.scheduler import TradingScheduler
+    from main.trading.workers import shard
+    from main.prompts.reset import reset_traders
+    from main.utils.metrics import registry
+
+    roster = shard(load_roster(path=None, count=traders), index, count)
+    reset_traders(roster)
+    scheduler = TradingScheduler(max_concurrency=concurrency, jitter=min(1.0, interval / 10))
+
+    def make_run(name):
+        async def run():
+            started = time.perf_counter()
+            await asyncio.to_thread(account_work, name, cpu)
+            await asyncio.sleep(think)
+            registry.histogram("bench_run_seconds").observe(time.perf_counter() - started)
+        return run
+
+    for spec in roster:
+        scheduler.add(spec.name, make_run(spec.name), interval)
+    stop = asyncio.Event()
+    asyncio.get_running_loop().call_later(seconds, stop.set)
+    cpu_started = time.process_time()
+    await scheduler.run(stop)
+    cpu_used = time.process_time() - cpu_started
+
+    def merged(name, **match):
+        values, count = [], 0
+        for metric_name, _, series in registry.collect():
+            if metric_name != name:
+                continue
+            for labels, histogram in series.items():
+                if all(dict(labels).get(key) == value for key, value in match.items()):
+                    values += histogram.window()
+                    count += histogram.count
+        values.sort()
+        return count, values
+
+    runs, run_seconds = merged("bench_run_seconds")
+    _, delays = merged("scheduler_start_delay_seconds")
+    _, db_reads = merged("db_operation_duration_seconds", operation="read_account")
+    _, db_writes = merged("db_operation_duration_seconds", operation="update_account")
+    return {
+        "traders": traders,
+        "runs": runs,
+        "expected_runs": round(len(roster) * seconds / interval),
+        "skipped": sum(job.overruns for job in scheduler.jobs),
+        "delays": delays,
+        "start_delay_p50": percentile(delays, 50),
+        "start_delay_p95": percentile(delays, 95),
+        "run_p95": percentile(run_seconds, 95),
+        "read_account_p95_ms": percentile(db_reads, 95) * 1000,
+        "update_account_p95_ms": percentile(db_writes, 95) * 1000,
+        "cpu_percent": cpu_used / seconds * 100,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traders", type=int, nargs="+", default=[4, 50, 100, 200])
+    parser.add_argument("--seconds", type=float, default=30, help="how long each roster size runs")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between each trader's runs")
+    parser.add_argument("--think", type=float, default=2, help="stand-in for the model's time per run")
+    parser.add_argument("--concurrency", type=int, default=16, help="MAX_CONCURRENT_TRADERS for each process")
+    parser.add_argument("--cpu", type=float, default=0.0, help="CPU seconds of account work per run")
+    parser.add_argument("--workers", type=int, default=1, help="processes to split each roster across")
+    parser.add_argument("--shard", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.shard is not None:
+        result = asyncio.run(run_floor(
+            args.traders[0], args.seconds, args.interval, args.think, args.concurrency, args.cpu, args.shard, args.workers
+        ))
+        print(json.dumps(result))
+        return
+
+    header = f"{'traders':>7} {'runs':>9} {'skipped':>7} {'delay p50/p95 s':>16} {'run p95 s':>9} {'read/update p95 ms':>18} {'cpu %':>6} {'rss MB':>7}"
+    print(header)
+    for traders in args.traders:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {**os.environ, "ACCOUNTS_DB": os.path.join(tmp, "accounts.db"), "PRICE_PROVIDER": "simulated"}
+            workers = [
+                subprocess.Popen(
+                    [sys.executable, __file__, "--shard", str(index), "--workers", str(args.workers),
+                     "--traders", str(traders), "--seconds", str(args.seconds), "--interval", str(args.interval),
+                     "--think", str(args.think), "--concurrency", str(args.concurrency), "--cpu", str(args.cpu)],
+                    env=env, cwd=root_dir, stdout=subprocess.PIPE, text=True,
+                )
+                for index in range(min(args.workers, traders))
+            ]
+            results = []
+            for worker in workers:
+                output, _ = worker.communicate()
+                if worker.returncode:
+                    raise SystemExit(f"Benchmark worker failed with code {worker.returncode}")
+                results.append(json.loads(output.strip().splitlines()[-1]))
+        delays = sorted(delay for r in results for delay in r["delays"])
+        print(
+            f"{traders:>7} {sum(r['runs'] for r in results):>4}/{sum(r['expected_runs'] for r in results):<4} "
+            f"{sum(r['skipped'] for r in results):>7} "
+            f"{percentile(delays, 50):>7.2f}/{percentile(delays, 95):<8.2f} {max(r['run_p95'] for r in results):>9.2f} "
+            f"{max(r['read_account_p95_ms'] for r in results):>8.1f}/{max(r['update_account_p95_ms'] for r in results):<9.1f} "
+            f"{sum(r['cpu_percent'] for r in results):>6.1f} {sum(r['max_rss_mb'] for r in results):>7.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()